@@ -71,7 +71,7 @@ SOURCES = [
 ]
 
 def add_sources():
-    app = create_app()
+    app = create_app({'SCRAPER_MODE': 'off'})
     with app.app_context():
         print("Adicionando fontes de exemplo...")
         
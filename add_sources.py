@@ -74,7 +74,7 @@ SOURCES = [
 ]
 
 def add_sources():
-    app = create_app()
+    app = create_app({'SCRAPER_MODE': 'off'})
     with app.app_context():
         print("Adicionando fontes RSS...")
         for source_data in SOURCES:
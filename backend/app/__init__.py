@@ -1,22 +1,105 @@
 from flask import Flask
+from flask.helpers import get_debug_flag
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from pathlib import Path
-from apscheduler.schedulers.background import BackgroundScheduler
-from datetime import datetime
+from sqlalchemy import event
+from werkzeug.serving import is_running_from_reloader
+import os
 
 db = SQLAlchemy()
 
-def create_app():
+def _is_reloader_parent(app) -> bool:
+    """No modo debug o processo pai só vigia os arquivos; quem atende é o filho"""
+    return (app.debug or get_debug_flag()) and not is_running_from_reloader()
+
+def _configure_sqlite(app):
+    """WAL e pragmas de desempenho em cada conexão nova do pool
+
+    Em WAL as leituras da API não esperam pelos commits do scraper; com
+    synchronous=NORMAL o commit não faz fsync (só o checkpoint), o que no
+    WAL continua seguro contra corrupção. busy_timeout faz um escritor
+    esperar pelo outro em vez de falhar com "database is locked".
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    pragmas = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}",
+        # Valor negativo: tamanho em KiB, e não em páginas
+        f"PRAGMA cache_size=-{int(app.config['SQLITE_CACHE_SIZE_KB'])}",
+    )
+    
+    @event.listens_for(db.engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+def create_app(config=None):
     app = Flask(__name__)
-    CORS(app)
+    # Expõe o cursor da paginação de /api/editais para clientes de outra origem
+    CORS(app, expose_headers=['X-Next-Cursor'])
     
     # Configure SQLite database
     base_dir = Path(__file__).resolve().parent.parent
     app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{base_dir}/cultura_alerta.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Pragmas aplicados a cada conexão (ver _configure_sqlite)
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = 5000
+    app.config['SQLITE_MMAP_SIZE'] = 256 * 1024 * 1024
+    app.config['SQLITE_CACHE_SIZE_KB'] = 64 * 1024
+    
+    # Scraper: 'embedded' agenda no próprio servidor web, 'worker' deixa para
+    # o processo backend/worker.py e 'off' não agenda nada
+    app.config['SCRAPER_MODE'] = os.environ.get('SCRAPER_MODE', 'embedded')
+    # Intervalo em que o agendador procura fontes vencidas; cada fonte tem sua
+    # própria agenda entre SCRAPER_MIN_POLL_MINUTES e SCRAPER_MAX_POLL_MINUTES
+    app.config['SCRAPER_INTERVAL_MINUTES'] = int(os.environ.get('SCRAPER_INTERVAL_MINUTES', 5))
+    app.config['SCRAPER_MIN_POLL_MINUTES'] = 15
+    app.config['SCRAPER_MAX_POLL_MINUTES'] = 24 * 60
+    app.config['SCRAPER_LEASE_SECONDS'] = 3600
+    # Páginas de artigos maiores que isto são truncadas durante o download
+    app.config['SCRAPER_MAX_PAGE_BYTES'] = 2 * 1024 * 1024
+    # Execuções simultâneas por tipo de extrator (fontes webpage/api); o
+    # max_concurrency do Source.config limita também o host da fonte
+    app.config['SCRAPER_EXTRACTOR_CONCURRENCY'] = 4
+    # Reverificação das páginas dos editais abertos: por execução e intervalo mínimo
+    app.config['SCRAPER_RECHECK_BATCH'] = 100
+    app.config['SCRAPER_RECHECK_HOURS'] = 24
+    # Fontes com tantas coletas seguidas com erro são desativadas (0 desliga)
+    app.config['SCRAPER_MAX_FAILURES'] = 10
+    # Dias de histórico mantidos em scrape_runs/scrape_source_results
+    app.config['SCRAPER_HISTORY_DAYS'] = 30
+    # Cache HTTP em disco das coletas; HTTP_CACHE_OFFLINE=1 reproduz as
+    # coletas só a partir do cache, sem acessar a rede
+    app.config['HTTP_CACHE_ENABLED'] = os.environ.get('HTTP_CACHE_ENABLED', '1') == '1'
+    app.config['HTTP_CACHE_PATH'] = str(base_dir / 'http_cache.db')
+    app.config['HTTP_CACHE_OFFLINE'] = os.environ.get('HTTP_CACHE_OFFLINE') == '1'
+    
+    if config:
+        app.config.update(config)
     
     db.init_app(app)
+    with app.app_context():
+        _configure_sqlite(app)
+    
+    # Fila única de escrita do scraper (commits em lote)
+    from .writer import db_writer
+    db_writer.init_app(app)
+    
+    from .cache import response_cache
+    response_cache.init_app(app)
+    
+    from .http_client import http_client
+    http_client.init_app(app)
+    
+    # Threads do pipeline do scraper: download de páginas e parse de HTML
+    from .workers import scrape_pool
+    scrape_pool.init_app(app)
     
     from .routes import main_bp
     app.register_blueprint(main_bp)
@@ -24,20 +107,15 @@ def create_app():
     with app.app_context():
         db.create_all()
         
-        # Configurar o scheduler para executar o scraper periodicamente
-        from .scraper import EditalScraper
-        scheduler = BackgroundScheduler()
-        
-        def run_scraper():
-            with app.app_context():
-                scraper = EditalScraper(app)
-                scraper.parse_rss_feeds()
-        
-        # Executar o scraper a cada 15 minutos
-        scheduler.add_job(run_scraper, 'interval', minutes=15)
+        # Índice de busca textual (FTS5) sincronizado por triggers
+        from .search import setup_fts
+        setup_fts()
+    
+    # Um único agendador por aplicação; execuções concorrentes são evitadas pelo lease
+    from .scheduler import ScrapeScheduler
+    scheduler = ScrapeScheduler(app)
+    app.extensions['scrape_scheduler'] = scheduler
+    if app.config['SCRAPER_MODE'] == 'embedded' and not _is_reloader_parent(app):
         scheduler.start()
-        
-        # Executar o scraper imediatamente na inicialização
-        run_scraper()
     
     return app
@@ -0,0 +1,144 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app, request
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import db
+from .models import AppState
+
+GENERATION_KEY = 'response_cache_generation'
+
+# Cabeçalhos da resposta original que também devem ser servidos a partir do cache
+CACHED_HEADERS = ('X-Next-Cursor',)
+
+class ResponseCache:
+    """Cache LRU em memória das respostas dos endpoints de leitura.
+
+    As entradas são marcadas com a geração em que foram criadas. Depois de
+    gravar no banco, a limpeza de cache chama ``bump()`` e o scraper manda
+    ``increment`` para a fila de escrita e chama ``refresh()``, o que
+    invalida de uma vez todas as respostas anteriores. A geração fica na
+    tabela app_state para que um scraper em outro processo (backend/worker.py)
+    também invalide o cache do servidor web; cada processo relê o valor a
+    cada ``sync_seconds``.
+    """
+
+    def __init__(self, max_entries: int = 256, sync_seconds: float = 5):
+        self.max_entries = max_entries
+        self.sync_seconds = sync_seconds
+        self.generation = 0
+        self._synced_at = 0.0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.setdefault('RESPONSE_CACHE_SIZE', self.max_entries)
+        self.sync_seconds = app.config.setdefault('RESPONSE_CACHE_SYNC_SECONDS', self.sync_seconds)
+
+    @staticmethod
+    def make_key(path: str, args) -> Tuple:
+        """Chave normalizada: a ordem e parâmetros vazios não geram entradas diferentes"""
+        items = sorted((k, v) for k, values in args.lists() for v in values if v != '')
+        return (path, tuple(items))
+
+    def bump(self):
+        """Invalida todas as respostas em cache, neste e nos demais processos"""
+        # Conexão própria para não interferir na transação da sessão atual
+        with db.engine.begin() as conn:
+            self.increment(conn)
+        self.refresh()
+
+    @staticmethod
+    def increment(session):
+        """Só incrementa a geração compartilhada, na transação de ``session``
+        (o scraper usa como job do db_writer e chama refresh() depois)"""
+        stmt = sqlite_insert(AppState.__table__).values(key=GENERATION_KEY, value=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['key'],
+            set_={'value': AppState.__table__.c.value + 1}
+        )
+        session.execute(stmt)
+
+    def refresh(self):
+        """Relê a geração agora, sem esperar ``sync_seconds``"""
+        self._set_generation(self._read_generation())
+
+    def sync(self):
+        """Relê a geração compartilhada se o último sincronismo já expirou"""
+        if time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+        self.refresh()
+
+    def _read_generation(self) -> int:
+        # Lê direto do banco: a sessão pode ter um AppState antigo no identity map
+        query = select(AppState.value).where(AppState.key == GENERATION_KEY)
+        with db.engine.connect() as conn:
+            return conn.execute(query).scalar() or 0
+
+    def _set_generation(self, generation: int):
+        with self._lock:
+            self._synced_at = time.monotonic()
+            if generation != self.generation:
+                self.generation = generation
+                self._entries.clear()
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['generation'] != self.generation:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Tuple, body: bytes, headers: Dict[str, str],
+            generation: int) -> Dict[str, Any]:
+        entry = {
+            'body': body,
+            'headers': headers,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'generation': generation,
+        }
+        with self._lock:
+            # Resposta calculada antes de um bump não deve entrar no cache
+            if generation == self.generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+response_cache = ResponseCache()
+
+def cached_response(view):
+    """Decorator para endpoints GET que retornam JSON derivado só do banco"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response_cache.sync()
+        key = response_cache.make_key(request.path, request.args)
+        entry = response_cache.get(key)
+
+        if entry is None:
+            generation = response_cache.generation
+            response = current_app.make_response(view(*args, **kwargs))
+            # Erros não vão para o cache
+            if response.status_code != 200:
+                return response
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            entry = response_cache.set(key, response.get_data(), headers, generation)
+
+        response = current_app.response_class(entry['body'], mimetype='application/json')
+        response.headers.update(entry['headers'])
+        # O navegador sempre revalida e recebe 304 se nada mudou
+        response.headers['Cache-Control'] = 'no-cache'
+        response.set_etag(entry['etag'])
+        return response.make_conditional(request)
+    return wrapper
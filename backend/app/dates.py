@@ -0,0 +1,96 @@
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# Mapeamento de nomes de meses em português
+MONTH_NAMES = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'marco': 3, 'abril': 4,
+    'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
+    'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12
+}
+
+# Todos os formatos em uma única expressão, percorrida uma vez só:
+# dd/mm/yyyy, dd-mm-yy, dd.mm.yyyy, yyyy-mm-dd e "dd de mês de yyyy".
+# Começar por um dígito permite ao re pular direto para os números do texto.
+DATE_RE = re.compile(
+    r'(?=\d)(?<!\d)(\d{1,4})'
+    r'(?:[/\-.](\d{1,2})[/\-.](\d{1,4})'
+    r'|º?\s+de\s+([a-zç]+)\.?\s+de\s+(\d{4}|\d{2}))'
+    r'(?!\d)',
+    re.IGNORECASE
+)
+
+# Palavras que indicam prazo final quando aparecem logo antes da data
+CONTEXT_RE = re.compile(
+    r'\b(?:prazo|até|ate|encerramento|encerra|vencimento|limite|término|termino)\b',
+    re.IGNORECASE
+)
+
+# Quantos caracteres antes da data são considerados contexto
+CONTEXT_WINDOW = 40
+
+MIN_YEAR = 2020
+MAX_YEAR = 2030
+
+def _to_date(day: str, month: str, year: str) -> Optional[datetime]:
+    if month.isalpha():
+        month = MONTH_NAMES.get(month.lower())
+        if month is None:
+            return None
+    if len(year) not in (2, 4):
+        return None
+    year = int(year)
+    # Ajusta o ano se necessário
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    try:
+        date = datetime(year, int(month), int(day))
+    except ValueError:
+        return None
+    # Ignora datas muito antigas ou muito futuras
+    if MIN_YEAR <= date.year <= MAX_YEAR:
+        return date
+    return None
+
+def _scan(text: str, stop_at_context: bool = False) -> List[Tuple[int, int, datetime]]:
+    candidates = []
+    for match in DATE_RE.finditer(text):
+        first, month, last, month_name, year = match.groups()
+        if month_name is not None:
+            date = _to_date(first, month_name, year)
+        elif len(first) == 4:  # yyyy-mm-dd
+            date = _to_date(last, month, first)
+        else:
+            date = _to_date(first, month, last)
+        if date is None:
+            continue
+        start = match.start()
+        score = 1 if CONTEXT_RE.search(text, max(0, start - CONTEXT_WINDOW), start) else 0
+        candidates.append((score, start, date))
+        # A primeira data com contexto sempre vence; não há por que continuar
+        if score and stop_at_context:
+            break
+    return candidates
+
+def find_dates(text: str) -> List[Tuple[int, int, datetime]]:
+    """Todas as datas válidas do texto como (pontuação, posição, data)"""
+    return _scan(text)
+
+def extract_scored_date(text: str) -> Tuple[Optional[datetime], int]:
+    """Como extract_date, mas devolve também a pontuação de contexto:
+    1 se a data vem depois de uma palavra de prazo, 0 se é uma data qualquer
+    (publicação, evento...)"""
+    if not text:
+        return None, 0
+    candidates = _scan(text, stop_at_context=True)
+    if not candidates:
+        return None, 0
+    score, _, date = max(candidates, key=lambda c: (c[0], -c[1]))
+    return date, score
+
+def extract_date(text: str) -> Optional[datetime]:
+    """Data mais provável de prazo: prefere datas precedidas de "prazo",
+    "até", "encerramento"...; em empate, a primeira do texto"""
+    return extract_scored_date(text)[0]
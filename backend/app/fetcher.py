@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
+import requests
+
+from .http_client import HttpClient
+
+
+class AsyncFeedFetcher:
+    """Baixa vários feeds ao mesmo tempo com limite global e por host.
+
+    O download em si usa o cliente HTTP compartilhado, executado em threads
+    pelo loop do asyncio; os semáforos garantem que no máximo
+    ``max_concurrency`` requisições estejam em andamento e no máximo
+    ``per_host`` para o mesmo servidor.
+    """
+
+    def __init__(self, client: HttpClient, max_concurrency: int = 20, per_host: int = 4):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.logger = logging.getLogger(__name__)
+
+    def fetch_all(self, sources: List[Any]) -> List[Dict[str, Any]]:
+        """Baixa todas as fontes e retorna um resultado por fonte, na mesma ordem"""
+        if not sources:
+            return []
+        # Copia os atributos necessários para não tocar nos objetos ORM fora da thread principal
+        requests_info = [{
+            'source': source,
+            'url': source.url,
+            'etag': source.etag,
+            'last_modified': source.last_modified,
+            # Timeout próprio da fonte (Source.config), senão o padrão do cliente
+            'timeout': (source.config or {}).get('timeout')
+        } for source in sources]
+        return asyncio.run(self._fetch_all(requests_info))
+
+    async def _fetch_all(self, requests_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        # O executor padrão do asyncio pode ter menos threads que o limite global
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            tasks = []
+            for info in requests_info:
+                host = urlparse(info['url']).netloc
+                if host not in host_limits:
+                    host_limits[host] = asyncio.Semaphore(self.per_host)
+                tasks.append(self._fetch(info, executor, global_limit, host_limits[host]))
+
+            return await asyncio.gather(*tasks)
+
+    async def _fetch(self, info: Dict[str, Any], executor: ThreadPoolExecutor,
+                     global_limit: asyncio.Semaphore,
+                     host_limit: asyncio.Semaphore) -> Dict[str, Any]:
+        result = {
+            'source': info['source'],
+            'url': info['url'],
+            'status': None,
+            'content': None,
+            'not_modified': False,
+            'etag': None,
+            'last_modified': None,
+            'error': None,
+            'started_at': None,
+            'elapsed': 0.0,
+            'bytes': None,
+        }
+        loop = asyncio.get_running_loop()
+        async with host_limit:
+            async with global_limit:
+                result['started_at'] = datetime.now()
+                started = time.perf_counter()
+                try:
+                    response = await loop.run_in_executor(executor, self._get, info)
+                    result['status'] = response.status_code
+                    if response.status_code == 304:
+                        result['not_modified'] = True
+                        return result
+                    response.raise_for_status()
+                    result['bytes'] = len(response.content)
+                    result['content'] = response.text
+                    result['etag'] = response.headers.get('ETag')
+                    result['last_modified'] = response.headers.get('Last-Modified')
+                except Exception as e:
+                    result['error'] = str(e)
+                    self.logger.error(f"Erro ao fazer requisição para {info['url']}: {str(e)}")
+                finally:
+                    # Só o download, sem a espera pelos semáforos
+                    result['elapsed'] = time.perf_counter() - started
+        return result
+
+    def _get(self, info: Dict[str, Any]) -> requests.Response:
+        # GET condicional: o servidor responde 304 se o feed não mudou
+        headers = {}
+        if info.get('etag'):
+            headers['If-None-Match'] = info['etag']
+        if info.get('last_modified'):
+            headers['If-Modified-Since'] = info['last_modified']
+        kwargs = {'timeout': info['timeout']} if info.get('timeout') else {}
+        return self.client.get(info['url'], headers=headers, **kwargs)
+
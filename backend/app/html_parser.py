@@ -0,0 +1,17 @@
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+def _available_parser() -> str:
+    """lxml (C) quando instalado; senão o html.parser da biblioteca padrão"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+DEFAULT_PARSER = _available_parser()
+
+def make_soup(markup: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """Cria a árvore BeautifulSoup com o parser mais rápido disponível"""
+    return BeautifulSoup(markup, parser or DEFAULT_PARSER)
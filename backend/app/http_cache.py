@@ -0,0 +1,179 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_responses_last_access ON responses (last_access);
+"""
+
+# Cabeçalhos que não fazem sentido reaproveitar numa resposta montada do cache
+SKIPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+class PrefixedStream:
+    """Corpo já parcialmente lido seguido do restante do stream original"""
+
+    def __init__(self, prefix: bytes, rest: Iterator[bytes], raw):
+        self._buffer = prefix
+        self._rest = rest
+        self._raw = raw
+
+    def read(self, amt: Optional[int] = None, **kwargs) -> bytes:
+        while not self._buffer:
+            chunk = next(self._rest, None)
+            if chunk is None:
+                return b''
+            self._buffer = chunk
+        amt = amt or len(self._buffer)
+        data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self):
+        self._raw.close()
+
+    def release_conn(self):
+        release = getattr(self._raw, 'release_conn', None)
+        if release:
+            release()
+
+class HttpCache:
+    """Cache persistente (SQLite) das respostas GET do scraper.
+
+    Respeita Cache-Control/Expires (``no-store`` não é gravado, ``max-age``
+    e Expires definem a validade, ``no-cache`` obriga a revalidar); sem esses
+    cabeçalhos a resposta vale ``default_ttl`` segundos. Quando o total
+    passa de ``max_bytes`` as entradas menos usadas recentemente são
+    removidas. No modo ``offline`` nada vai para a rede: tudo é respondido
+    do cache, vencido ou não, o que permite reproduzir uma coleta real sem
+    acesso à internet.
+    """
+
+    def __init__(self, path: str, default_ttl: float = 300, max_bytes: int = 200 * 1024 * 1024,
+                 max_entry_bytes: int = 2 * 1024 * 1024, offline: bool = False):
+        self.logger = logging.getLogger(__name__)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, expires_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE url = ?', (time.time(), url))
+        status, headers, body, expires_at = row
+        return {
+            'status': status,
+            'headers': CaseInsensitiveDict(json.loads(headers)),
+            'body': body,
+            'fresh': expires_at > time.time(),
+        }
+
+    def freshness(self, headers) -> Optional[float]:
+        """Segundos de validade pelos cabeçalhos; None se não deve ser gravada"""
+        directives = {}
+        for part in headers.get('Cache-Control', '').lower().split(','):
+            name, _, value = part.strip().partition('=')
+            if name:
+                directives[name] = value.strip('"')
+        if 'no-store' in directives or 'private' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0.0
+        if 'max-age' in directives:
+            try:
+                return max(0.0, float(directives['max-age']))
+            except ValueError:
+                return 0.0
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                return max(0.0, parsedate_to_datetime(expires).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return 0.0  # Expires inválido (ex.: "0") equivale a já vencida
+        return self.default_ttl
+
+    def store(self, url: str, response: requests.Response, body: bytes):
+        ttl = self.freshness(response.headers)
+        if ttl is None or len(body) > self.max_entry_bytes:
+            return
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in SKIPPED_HEADERS}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, status, headers, body, size, stored_at, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, response.status_code, json.dumps(headers), body, len(body), now, now + ttl, now)
+            )
+            self._evict()
+
+    def refresh(self, url: str, response: requests.Response):
+        """Servidor respondeu 304: a cópia guardada volta a valer"""
+        ttl = self.freshness(response.headers)
+        if ttl is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET expires_at = ?, last_access = ? WHERE url = ?',
+                (time.time() + ttl, time.time(), url)
+            )
+
+    def _evict(self):
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Remove as menos usadas recentemente até caber no limite
+        excess = total - self.max_bytes
+        freed = 0
+        urls = []
+        for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY last_access'):
+            urls.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany('DELETE FROM responses WHERE url = ?', urls)
+        self.logger.info(f"HTTP cache: evicted {len(urls)} entries ({freed} bytes)")
+
+    @staticmethod
+    def build_response(url: str, entry: Dict[str, Any], status: Optional[int] = None) -> requests.Response:
+        """Monta uma requests.Response a partir de uma entrada do cache"""
+        response = requests.Response()
+        response.url = url
+        response.status_code = status or entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = 'Not Modified' if response.status_code == 304 else 'OK'
+        # Conteúdo já "consumido": iter_content devolve fatias do corpo guardado
+        response._content = b'' if response.status_code == 304 else entry['body']
+        response._content_consumed = True
+        response.from_cache = True
+        return response
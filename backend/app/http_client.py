@@ -0,0 +1,394 @@
+import codecs
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from .http_cache import HttpCache, PrefixedStream
+
+# Desabilitar avisos SSL (vários sites do governo têm certificados incompletos)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Tipos aceitos quando só queremos HTML (páginas de artigos)
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Únicos tipos gravados no cache HTTP: páginas e feeds
+CACHEABLE_CONTENT_TYPES = HTML_CONTENT_TYPES + (
+    'application/rss+xml', 'application/atom+xml', 'application/rdf+xml', 'application/xml', 'text/xml'
+)
+
+# Assinaturas de corpos binários que não vale a pena baixar inteiros
+BINARY_SIGNATURES = (b'%PDF', b'PK\x03\x04', b'\x89PNG', b'\xff\xd8\xff', b'GIF8', b'\xd0\xcf\x11\xe0')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+class HostThrottle:
+    """Espaçamento mínimo entre requisições ao mesmo host e bloqueio por Retry-After"""
+
+    def __init__(self, min_interval: float = 0.0):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        """Reserva o próximo horário livre do host e espera até ele"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0), self._blocked_until.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def block(self, host: str, seconds: float):
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until[host] = max(until, self._blocked_until.get(host, 0.0))
+
+class CappedRetry(Retry):
+    """Retry do urllib3 que respeita Retry-After só até ``max_retry_after``
+
+    Sem o teto o urllib3 dorme o tempo que o servidor pedir (horas, às
+    vezes) antes de cada nova tentativa, prendendo o worker.
+    """
+
+    def __init__(self, *args, max_retry_after: float = 120, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kw) -> 'CappedRetry':
+        kw.setdefault('max_retry_after', self.max_retry_after)
+        return super().new(**kw)
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+class CircuitOpenError(requests.ConnectionError):
+    """Host com o circuito aberto: a requisição falha sem ir para a rede"""
+
+class HostCircuitBreaker:
+    """Circuit breaker por host, compartilhado por todas as requisições.
+
+    Depois de ``threshold`` falhas seguidas (erro de conexão, timeout ou
+    status 429/5xx já esgotados os retries) o circuito do host abre e as
+    requisições falham na hora por ``cooldown`` segundos. Passado esse
+    tempo, uma única requisição de teste é liberada: se der certo o
+    circuito fecha, senão volta a abrir por mais um ``cooldown``.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60):
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: set = set()
+        self._lock = threading.Lock()
+
+    def before_request(self, host: str):
+        """Levanta CircuitOpenError se o host estiver bloqueado"""
+        if not self.threshold:
+            return
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            remaining = opened_at + self.cooldown - time.monotonic()
+            if remaining > 0 or host in self._probing:
+                raise CircuitOpenError(f"Circuito aberto para {host} (nova tentativa em {max(remaining, 0):.0f}s)")
+            # Cooldown vencido: esta requisição é o teste
+            self._probing.add(host)
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._probing.discard(host)
+            if self._opened_at.pop(host, None) is not None:
+                self.logger.info(f"Circuito fechado para {host}")
+
+    def record_failure(self, host: str):
+        if not self.threshold:
+            return
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            probe_failed = host in self._probing
+            self._probing.discard(host)
+            if probe_failed or failures >= self.threshold:
+                if probe_failed or host not in self._opened_at:
+                    self.logger.warning(
+                        f"Circuito aberto para {host} por {self.cooldown:.0f}s após {failures} falhas seguidas"
+                    )
+                self._opened_at[host] = time.monotonic()
+
+class HttpClient:
+    """Cliente HTTP compartilhado por todo o backend.
+
+    Uma única ``requests.Session`` com pool de conexões por host (keep-alive
+    reaproveitado entre feeds e páginas do mesmo servidor), a única política
+    de retry do backend (no adapter, com backoff e Retry-After), política
+    única de timeout, cortesia e circuit breaker por host. Quem chama não
+    deve repetir requisições por conta própria.
+    """
+
+    # Status repetidos pelo retry e contados como falha do host pelo circuit breaker
+    RETRY_STATUSES = (429, 500, 502, 503, 504, 520)
+
+    def __init__(self, pool_hosts: int = 32, pool_per_host: int = 8,
+                 connect_timeout: float = 5, read_timeout: float = 15,
+                 min_host_interval: float = 0.2, max_retry_after: float = 120,
+                 retries: int = 3, retry_backoff: float = 1,
+                 breaker_threshold: int = 5, breaker_cooldown: float = 60):
+        self.logger = logging.getLogger(__name__)
+        self.max_retry_after = max_retry_after
+        self.cache: Optional[HttpCache] = None
+        self.configure(pool_hosts, pool_per_host, connect_timeout, read_timeout, min_host_interval,
+                       retries, retry_backoff, breaker_threshold, breaker_cooldown)
+
+    def init_app(self, app):
+        self.configure(
+            pool_hosts=app.config.setdefault('HTTP_POOL_HOSTS', 32),
+            pool_per_host=app.config.setdefault('HTTP_POOL_PER_HOST', 8),
+            connect_timeout=app.config.setdefault('HTTP_CONNECT_TIMEOUT', 5),
+            read_timeout=app.config.setdefault('HTTP_READ_TIMEOUT', 15),
+            min_host_interval=app.config.setdefault('HTTP_MIN_HOST_INTERVAL', 0.2),
+            max_retry_after=app.config.setdefault('HTTP_MAX_RETRY_AFTER', 120),
+            retries=app.config.setdefault('HTTP_RETRIES', 3),
+            retry_backoff=app.config.setdefault('HTTP_RETRY_BACKOFF', 1),
+            breaker_threshold=app.config.setdefault('HTTP_BREAKER_THRESHOLD', 5),
+            breaker_cooldown=app.config.setdefault('HTTP_BREAKER_COOLDOWN', 60)
+        )
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+        if app.config.setdefault('HTTP_CACHE_ENABLED', False):
+            self.cache = HttpCache(
+                path=app.config['HTTP_CACHE_PATH'],
+                default_ttl=app.config.setdefault('HTTP_CACHE_TTL', 300),
+                max_bytes=app.config.setdefault('HTTP_CACHE_MAX_BYTES', 200 * 1024 * 1024),
+                max_entry_bytes=app.config.setdefault('HTTP_CACHE_MAX_ENTRY_BYTES', 2 * 1024 * 1024),
+                offline=app.config.setdefault('HTTP_CACHE_OFFLINE', False)
+            )
+
+    def configure(self, pool_hosts: int, pool_per_host: int, connect_timeout: float,
+                  read_timeout: float, min_host_interval: float, retries: int = 3,
+                  retry_backoff: float = 1, breaker_threshold: int = 5, breaker_cooldown: float = 60,
+                  max_retry_after: Optional[float] = None):
+        if max_retry_after is not None:
+            self.max_retry_after = max_retry_after
+        self.pool_per_host = pool_per_host
+        self.timeout = (connect_timeout, read_timeout)
+        self.throttle = HostThrottle(min_host_interval)
+        self.breaker = HostCircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.session = self._create_session(pool_hosts, pool_per_host, retries, retry_backoff)
+
+    def _create_session(self, pool_hosts: int, pool_per_host: int,
+                        retries: int, retry_backoff: float) -> requests.Session:
+        """Cria a sessão HTTP com retry e pool de conexões por host"""
+        session = requests.Session()
+        retry_strategy = CappedRetry(
+            total=retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            respect_retry_after_header=True,
+            max_retry_after=self.max_retry_after,
+            # Devolve a última resposta em vez de levantar RetryError
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_per_host
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.verify = False
+        session.headers.update({'User-Agent': USER_AGENT})
+        return session
+
+    def request(self, method: str, url: str, max_bytes: Optional[int] = None, **kwargs) -> requests.Response:
+        """``max_bytes``: quanto quem chama vai ler de uma resposta em streaming
+        (ver read_limited); o cache nunca guarda mais do que isso em memória"""
+        if method == 'GET' and self.cache is not None:
+            return self._cached_get(url, max_bytes=max_bytes, **kwargs)
+        return self._send(method, url, **kwargs)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        host = urlparse(url).netloc
+        self.breaker.before_request(host)
+        self.throttle.wait(host)
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            # Qualquer exceção conta, senão uma requisição de teste deixaria o host travado
+            self.breaker.record_failure(host)
+            raise
+        if response.status_code in self.RETRY_STATUSES:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        if response.status_code in (429, 503):
+            retry_after = self._retry_after_seconds(response)
+            if retry_after:
+                self.logger.warning(f"{host} pediu Retry-After de {retry_after:.0f}s")
+                self.throttle.block(host, retry_after)
+        return response
+
+    def _cached_get(self, url: str, max_bytes: Optional[int] = None, **kwargs) -> requests.Response:
+        """GET passando pelo cache em disco (ver HttpCache)"""
+        params = kwargs.get('params')
+        key = requests.Request('GET', url, params=params).prepare().url if params else url
+        headers = CaseInsensitiveDict(kwargs.pop('headers', None) or {})
+        caller_conditional = 'If-None-Match' in headers or 'If-Modified-Since' in headers
+        entry = self.cache.lookup(key)
+
+        if entry and (entry['fresh'] or self.cache.offline):
+            # Quem chamou já tem esta versão: responde 304 como o servidor faria
+            if caller_conditional and self._same_version(headers, entry['headers']):
+                return HttpCache.build_response(key, entry, status=304)
+            return HttpCache.build_response(key, entry)
+        if self.cache.offline:
+            raise requests.ConnectionError(f"Modo offline: {key} não está no cache HTTP")
+
+        # Cópia vencida: revalida com os validadores guardados
+        if entry and not caller_conditional:
+            if entry['headers'].get('ETag'):
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        response = self._send('GET', url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry:
+            self.cache.refresh(key, response)
+            if not caller_conditional:
+                response.close()
+                return HttpCache.build_response(key, entry)
+        elif response.status_code == 200:
+            return self._store(key, response, kwargs.get('stream', False), max_bytes)
+        return response
+
+    @staticmethod
+    def _same_version(request_headers, cached_headers) -> bool:
+        etag = cached_headers.get('ETag')
+        if etag and request_headers.get('If-None-Match') == etag:
+            return True
+        last_modified = cached_headers.get('Last-Modified')
+        return bool(last_modified) and request_headers.get('If-Modified-Since') == last_modified
+
+    @staticmethod
+    def _cacheable_type(response: requests.Response) -> bool:
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        # Sem Content-Type decide pelos primeiros bytes (assinaturas binárias)
+        return not content_type or content_type in CACHEABLE_CONTENT_TYPES
+
+    def _store(self, key: str, response: requests.Response, stream: bool,
+               max_bytes: Optional[int] = None) -> requests.Response:
+        # Só HTML/XML vai para o cache; PDFs, imagens etc. seguem intactos
+        # para quem chamou, que decide (read_limited) se lê o corpo
+        if not self._cacheable_type(response):
+            return response
+        if not stream:
+            if not response.content.lstrip().startswith(BINARY_SIGNATURES):
+                self.cache.store(key, response, response.content)
+            return response
+        # Em streaming lê no máximo o que quem chamou leria e o limite de uma
+        # entrada; corpos binários ou maiores não são gravados e seguem para
+        # quem chamou sem perder o que já foi lido
+        limit = self.cache.max_entry_bytes if max_bytes is None else min(max_bytes, self.cache.max_entry_bytes)
+        chunks = []
+        size = 0
+        iterator = response.iter_content(chunk_size=64 * 1024)
+        for chunk in iterator:
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit or (len(chunks) == 1 and chunk.lstrip().startswith(BINARY_SIGNATURES)):
+                response.raw = PrefixedStream(b''.join(chunks), iterator, response.raw)
+                return response
+        body = b''.join(chunks)
+        self.cache.store(key, response, body)
+        response._content = body
+        response._content_consumed = True
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def read_limited(self, response: requests.Response, max_bytes: int,
+                     content_types: Tuple[str, ...] = HTML_CONTENT_TYPES,
+                     chunk_size: int = 64 * 1024) -> Optional[str]:
+        """Lê o corpo de uma resposta em streaming, até ``max_bytes``
+
+        Retorna None se o Content-Type (ou os primeiros bytes) indicarem um
+        corpo fora de ``content_types``. Ao atingir o limite a leitura para e
+        o texto já lido é devolvido truncado, mantendo a memória por worker
+        limitada. A resposta deve ter sido obtida com ``stream=True``.
+        """
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in content_types and content_type != 'application/octet-stream':
+            self.logger.info(f"Ignorando {response.url}: Content-Type {content_type}")
+            return None
+
+        chunks = []
+        size = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunks and chunk.lstrip().startswith(BINARY_SIGNATURES):
+                self.logger.info(f"Ignorando {response.url}: conteúdo binário")
+                return None
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                self.logger.warning(f"{response.url} excedeu {max_bytes} bytes, conteúdo truncado")
+                truncated = True
+                break
+        body = b''.join(chunks)[:max_bytes]
+        return self._decode(body, response, truncated)
+
+    @staticmethod
+    def _decode(body: bytes, response: requests.Response, truncated: bool) -> str:
+        # Decodificador incremental: se o corte caiu no meio de um caractere
+        # multibyte (final=False), os bytes soltos do fim são descartados em
+        # vez de invalidar o texto todo
+        if 'charset' in response.headers.get('Content-Type', '').lower() and response.encoding:
+            try:
+                decoder = codecs.getincrementaldecoder(response.encoding)(errors='replace')
+                return decoder.decode(body, final=not truncated)
+            except LookupError:
+                pass
+        # Sem charset no cabeçalho o requests assume ISO-8859-1; tenta UTF-8 antes
+        try:
+            return codecs.getincrementaldecoder('utf-8')().decode(body, final=not truncated)
+        except UnicodeDecodeError:
+            return body.decode('iso-8859-1')
+
+    def _retry_after_seconds(self, response: requests.Response) -> Optional[float]:
+        """Interpreta Retry-After em segundos ou como data HTTP"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return max(0.0, min(seconds, self.max_retry_after))
+
+http_client = HttpClient()
@@ -0,0 +1,153 @@
+import re
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# Palavras-chave de relevância
+RELEVANCE_KEYWORDS = {
+    # Prioridade alta (precisa ter pelo menos uma)
+    'high_priority': [
+        'edital', 'chamada pública', 'seleção', 'concurso',
+        'prêmio', 'inscrição', 'inscrições'
+    ],
+    # Prioridade média (precisa ter pelo menos duas)
+    'medium_priority': [
+        'cultura', 'cultural', 'arte', 'artista', 'artístico',
+        'música', 'teatro', 'dança', 'cinema', 'literatura',
+        'patrimônio', 'museu', 'biblioteca', 'exposição'
+    ],
+    # Prioridade baixa (aumenta relevância)
+    'low_priority': [
+        'fomento', 'incentivo', 'financiamento', 'patrocínio',
+        'apoio', 'lei rouanet', 'proac', 'fundo', 'recurso'
+    ]
+}
+
+# Categorias em ordem de prioridade: vence a primeira com alguma palavra encontrada
+CATEGORIA_KEYWORDS = {
+    'Música': ['música', 'musical', 'músico', 'musicista', 'concerto', 'show'],
+    'Teatro': ['teatro', 'teatral', 'dramaturgia', 'cênico', 'espetáculo'],
+    'Dança': ['dança', 'bailarino', 'coreografia'],
+    'Cinema': ['cinema', 'audiovisual', 'filme', 'curta-metragem'],
+    'Literatura': ['literatura', 'livro', 'escritor', 'poesia', 'conto'],
+    'Artes Visuais': ['artes visuais', 'exposição', 'galeria', 'artista plástico'],
+    'Patrimônio': ['patrimônio', 'histórico', 'cultural', 'preservação'],
+    'Fomento': ['fomento', 'incentivo', 'financiamento', 'patrocínio'],
+    'Formação': ['formação', 'workshop', 'oficina', 'curso', 'capacitação'],
+    # Genéricas, só usadas se nenhuma categoria temática aparecer
+    'Edital': ['edital'],
+    'Prêmio': ['prêmio'],
+    'Concurso': ['concurso'],
+}
+
+DEFAULT_CATEGORIA = 'Outros'
+
+# Categorias que não dizem a área cultural do edital
+GENERIC_CATEGORIAS = ('Edital', 'Prêmio', 'Concurso', DEFAULT_CATEGORIA)
+
+KeywordHits = Dict[Hashable, Set[str]]
+
+def _plural_word(word: str) -> str:
+    if word.endswith('ão'):
+        return word[:-2] + 'ões'          # seleção -> seleções
+    if word.endswith('al'):
+        return word[:-2] + 'ais'          # cultural -> culturais, edital -> editais
+    if word.endswith('m'):
+        return word[:-1] + 'ns'           # curta-metragem -> curta-metragens
+    if word.endswith(('r', 'z')):
+        return word + 'es'                # escritor -> escritores
+    if word.endswith('s'):
+        return word                       # já no plural (artes visuais)
+    return word + 's'
+
+def plural(keyword: str) -> str:
+    """Plural regular em português de cada palavra ("chamada pública" -> "chamadas públicas")"""
+    return ' '.join(_plural_word(word) for word in keyword.split())
+
+class KeywordMatcher:
+    """Vários grupos de palavras-chave casados em uma única passada pelo texto.
+
+    Todas as palavras, no singular e no plural (ver plural), viram uma só
+    alternação com limites de palavra, então "show" não casa com "showroom"
+    nem "curso" com "concurso", mas "culturais" conta como "cultural".
+    Expressões compostas ("artes visuais") também contam as palavras-chave
+    que contêm ("arte").
+    """
+
+    def __init__(self, groups: Dict[Hashable, Iterable[str]]):
+        self.groups = {name: tuple(keywords) for name, keywords in groups.items()}
+        keywords = sorted({kw.lower() for kws in self.groups.values() for kw in kws})
+        # Forma flexionada -> palavra-chave (o singular tem precedência)
+        forms: Dict[str, str] = {}
+        for keyword in keywords:
+            forms.setdefault(plural(keyword), keyword)
+        forms.update({keyword: keyword for keyword in keywords})
+        self.pattern = re.compile(r'\b(' + self._trie_pattern(sorted(forms)) + r')\b')
+        # Palavra encontrada -> (grupo, palavra-chave) creditados por ela
+        credits: Dict[str, List[Tuple[Hashable, str]]] = {}
+        for keyword in keywords:
+            contained = [other for other in keywords if other == keyword or self._contains(keyword, other)]
+            credits[keyword] = [
+                (name, other) for other in contained
+                for name, kws in self.groups.items() if other in kws
+            ]
+        self._credits = {form: credits[keyword] for form, keyword in forms.items()}
+
+    @staticmethod
+    def _trie_pattern(words: List[str]) -> str:
+        """Alternação em forma de trie ("arte(?:s visuais)?|..."): prefixos comuns
+        são testados uma vez só, bem mais rápido que uma alternação plana no re"""
+        trie: dict = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: dict) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # Palavra completa neste ponto: o restante é opcional (guloso, ganha a mais longa)
+            return '(?:' + body + ')?' if '' in node else body
+
+        return build(trie)
+
+    @staticmethod
+    def _contains(phrase: str, keyword: str) -> bool:
+        return any(re.search(r'\b' + re.escape(form) + r'\b', phrase) is not None
+                   for form in (keyword, plural(keyword)))
+
+    def scan(self, text: str) -> KeywordHits:
+        """Palavras-chave distintas encontradas no texto, por grupo"""
+        hits: KeywordHits = {name: set() for name in self.groups}
+        if text:
+            for match in self.pattern.finditer(text.lower()):
+                for name, keyword in self._credits[match.group(1)]:
+                    hits[name].add(keyword)
+        return hits
+
+matcher = KeywordMatcher({
+    **{('relevance', name): kws for name, kws in RELEVANCE_KEYWORDS.items()},
+    **{('categoria', name): kws for name, kws in CATEGORIA_KEYWORDS.items()},
+})
+
+def scan(text: str) -> KeywordHits:
+    return matcher.scan(text)
+
+def is_relevant(hits: KeywordHits) -> bool:
+    """Pelo menos uma palavra de alta prioridade, duas de média, ou uma média e uma baixa"""
+    if hits[('relevance', 'high_priority')]:
+        return True
+    medium_count = len(hits[('relevance', 'medium_priority')])
+    if medium_count >= 2:
+        return True
+    return medium_count >= 1 and bool(hits[('relevance', 'low_priority')])
+
+def is_thematic(categoria: Optional[str]) -> bool:
+    return categoria is not None and categoria not in GENERIC_CATEGORIAS
+
+def categoria(hits: KeywordHits) -> Optional[str]:
+    for name in CATEGORIA_KEYWORDS:
+        if hits[('categoria', name)]:
+            return name
+    return DEFAULT_CATEGORIA
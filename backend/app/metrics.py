@@ -0,0 +1,154 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Etapas de um ciclo do scraper, na ordem do pipeline
+STAGES = ('feed_fetch', 'feed_parse', 'relevance_filter', 'page_fetch',
+          'html_parse', 'extract', 'dedup', 'commit')
+
+# Limites (segundos) dos buckets dos histogramas de latência
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    __slots__ = ('buckets', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+class ScrapeMetrics:
+    """Contadores e histogramas de latência por etapa e por fonte.
+
+    ``scrape_metrics`` acumula desde o início do processo e é exposto em
+    /api/metrics no formato do Prometheus. Cada execução do scraper cria a
+    sua própria instância com ``parent=scrape_metrics``: tudo que ela registra
+    também vai para o acumulado, e ela sozinha gera a tabela de resumo da
+    execução. As etapas que rodam no pool são medidas por thread, então a
+    soma dos tempos pode passar do tempo total da execução.
+    """
+
+    def __init__(self, parent: Optional['ScrapeMetrics'] = None):
+        self.parent = parent
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, stage: str, source: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get((stage, source))
+            if histogram is None:
+                histogram = self._histograms[(stage, source)] = Histogram()
+            histogram.observe(seconds)
+        if self.parent:
+            self.parent.observe(stage, source, seconds)
+
+    def inc(self, event: str, source: str, amount: int = 1):
+        with self._lock:
+            self._counters[(event, source)] = self._counters.get((event, source), 0) + amount
+        if self.parent:
+            self.parent.inc(event, source, amount)
+
+    @contextmanager
+    def timer(self, stage: str, source: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, source, time.perf_counter() - started)
+
+    def timed(self, stage: str, source: str, func: Callable) -> Callable:
+        """Versão de ``func`` que mede a própria execução (para tarefas do pool)"""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.timer(stage, source):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def summary(self) -> List[Dict]:
+        """Linhas (etapa, fonte) ordenadas pelo tempo total gasto"""
+        with self._lock:
+            rows = [{
+                'stage': stage,
+                'source': source,
+                'count': histogram.count,
+                'total': histogram.sum,
+                'mean': histogram.sum / histogram.count if histogram.count else 0.0,
+                'max': histogram.max,
+            } for (stage, source), histogram in self._histograms.items()]
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+    def format_summary(self, limit: int = 15) -> str:
+        """Tabela de texto: total por etapa e as combinações etapa/fonte mais caras"""
+        rows = self.summary()
+        if not rows:
+            return ''
+        by_stage: Dict[str, Dict] = {}
+        for row in rows:
+            stage = by_stage.setdefault(row['stage'], {'stage': row['stage'], 'source': '(todas)',
+                                                       'count': 0, 'total': 0.0, 'max': 0.0})
+            stage['count'] += row['count']
+            stage['total'] += row['total']
+            stage['max'] = max(stage['max'], row['max'])
+        for stage in by_stage.values():
+            stage['mean'] = stage['total'] / stage['count'] if stage['count'] else 0.0
+        ordered = sorted(by_stage.values(), key=lambda row: STAGES.index(row['stage'])
+                         if row['stage'] in STAGES else len(STAGES))
+
+        lines = [f"{'etapa':<17} {'fonte':<30} {'n':>6} {'total s':>9} {'média ms':>9} {'máx ms':>9}"]
+        for row in ordered + rows[:limit]:
+            lines.append(
+                f"{row['stage']:<17} {row['source'][:30]:<30} {row['count']:>6} {row['total']:>9.2f} "
+                f"{row['mean'] * 1000:>9.1f} {row['max'] * 1000:>9.1f}"
+            )
+        return '\n'.join(lines)
+
+    def render_prometheus(self) -> str:
+        """Formato texto de exposição do Prometheus (version=0.0.4)"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = [
+            '# HELP scraper_stage_seconds Tempo gasto em cada etapa do scraper, por fonte.',
+            '# TYPE scraper_stage_seconds histogram',
+        ]
+        for (stage, source), histogram in histograms:
+            labels = f'stage="{_escape(stage)}",source="{_escape(source)}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.buckets):
+                cumulative += count
+                lines.append(f'scraper_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'scraper_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'scraper_stage_seconds_sum{{{labels}}} {histogram.sum:.6f}')
+            lines.append(f'scraper_stage_seconds_count{{{labels}}} {histogram.count}')
+
+        lines += [
+            '# HELP scraper_events_total Eventos do scraper (entradas, páginas, editais), por fonte.',
+            '# TYPE scraper_events_total counter',
+        ]
+        for (event, source), value in counters:
+            lines.append(f'scraper_events_total{{event="{_escape(event)}",source="{_escape(source)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+scrape_metrics = ScrapeMetrics()
@@ -1,8 +1,19 @@
 from . import db
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class Edital(db.Model):
     __tablename__ = 'editais'
+    __table_args__ = (
+        # Garante que o mesmo link não seja inserido duas vezes (ON CONFLICT)
+        db.Index('ux_editais_link', 'link', unique=True),
+        # Índices para os filtros e a ordenação de /api/editais
+        db.Index('ix_editais_data_publicacao', 'data_publicacao'),
+        db.Index('ix_editais_categoria_data_publicacao', 'categoria', 'data_publicacao'),
+        db.Index('ix_editais_data_vencimento', 'data_vencimento'),
+        db.Index('ix_editais_categoria_data_vencimento', 'categoria', 'data_vencimento'),
+        # Seleção dos editais abertos cuja página deve ser reverificada
+        db.Index('ix_editais_checked_at', 'checked_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(255), nullable=False)
@@ -13,18 +24,26 @@ class Edital(db.Model):
     descricao = db.Column(db.Text)
     fonte = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Detecção de mudanças na página: hash do texto normalizado e validadores HTTP
+    content_hash = db.Column(db.String(64))
+    page_etag = db.Column(db.String(255))
+    page_last_modified = db.Column(db.String(255))
+    checked_at = db.Column(db.DateTime)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'nome': self.nome,
-            'link': self.link,
-            'data_publicacao': self.data_publicacao.isoformat() if self.data_publicacao else None,
-            'data_vencimento': self.data_vencimento.isoformat() if self.data_vencimento else None,
-            'categoria': self.categoria,
-            'descricao': self.descricao,
-            'fonte': self.fonte
-        }
+    # Campos que podem ser pedidos em /api/editais?fields=
+    PUBLIC_FIELDS = (
+        'id', 'nome', 'link', 'data_publicacao', 'data_vencimento',
+        'categoria', 'descricao', 'fonte'
+    )
+    
+    def to_dict(self, fields=None):
+        data = {}
+        for field in fields or self.PUBLIC_FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            data[field] = value
+        return data
 
 class Source(db.Model):
     __tablename__ = 'sources'
@@ -35,6 +54,16 @@ class Source(db.Model):
     type = db.Column(db.String(20), nullable=False)  # rss, webpage, api
     active = db.Column(db.Boolean, default=True)
     last_scrape = db.Column(db.DateTime)
+    # Validadores HTTP da última resposta do feed (GET condicional)
+    etag = db.Column(db.String(255))
+    last_modified = db.Column(db.String(64))
+    # Agenda adaptativa: intervalo atual, próxima coleta e histórico de novidades
+    poll_interval = db.Column(db.Integer)  # minutos
+    next_poll_at = db.Column(db.DateTime)
+    last_new_entry_at = db.Column(db.DateTime)
+    empty_polls = db.Column(db.Integer, default=0)
+    # Coletas seguidas com erro; a fonte é desativada ao passar do limite
+    consecutive_failures = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -49,11 +78,40 @@ class Source(db.Model):
             'type': self.type,
             'active': self.active,
             'last_scrape': self.last_scrape.isoformat() if self.last_scrape else None,
+            'poll_interval': self.poll_interval,
+            'next_poll_at': self.next_poll_at.isoformat() if self.next_poll_at else None,
+            'last_new_entry_at': self.last_new_entry_at.isoformat() if self.last_new_entry_at else None,
+            'consecutive_failures': self.consecutive_failures or 0,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
             'config': self.config or {}
         }
         
+    def register_poll(self, new_entries: int, min_interval: int, max_interval: int,
+                      now: datetime = None):
+        """Recalcula o intervalo de coleta a partir do resultado da última coleta
+
+        Feeds sem novidades dobram o intervalo (backoff exponencial); feeds com
+        novidades reduzem o intervalo pela metade, ou para metade do tempo
+        observado entre as duas últimas novidades, se for menor.
+        """
+        now = now or datetime.now()
+        interval = self.poll_interval or min_interval
+        
+        if new_entries > 0:
+            interval = interval // 2
+            if self.last_new_entry_at:
+                gap = (now - self.last_new_entry_at).total_seconds() / 60
+                interval = min(interval, int(gap // 2))
+            self.last_new_entry_at = now
+            self.empty_polls = 0
+        else:
+            interval = interval * 2
+            self.empty_polls = (self.empty_polls or 0) + 1
+        
+        self.poll_interval = max(min_interval, min(max_interval, interval))
+        self.next_poll_at = now + timedelta(minutes=self.poll_interval)
+    
     @classmethod
     def create_source(cls, name, url, type='rss', config=None):
         """Helper para criar uma nova fonte com configurações"""
@@ -70,3 +128,90 @@ class Source(db.Model):
         except Exception as e:
             db.session.rollback()
             raise e
+
+class SchedulerLease(db.Model):
+    """Trava entre processos: só o dono do lease executa o job com este nome"""
+    __tablename__ = 'scheduler_leases'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(100), nullable=False)
+    acquired_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class AppState(db.Model):
+    """Contadores compartilhados entre os processos da aplicação"""
+    __tablename__ = 'app_state'
+    
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+class ScrapeRun(db.Model):
+    """Uma execução do scraper (todas as fontes coletadas naquela rodada)"""
+    __tablename__ = 'scrape_runs'
+    __table_args__ = (
+        db.Index('ix_scrape_runs_started_at', 'started_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    finished_at = db.Column(db.DateTime)
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed, failed
+    sources_count = db.Column(db.Integer, default=0)
+    failed_sources = db.Column(db.Integer, default=0)
+    new_editais = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration': (self.finished_at - self.started_at).total_seconds() if self.finished_at else None,
+            'status': self.status,
+            'sources_count': self.sources_count or 0,
+            'failed_sources': self.failed_sources or 0,
+            'new_editais': self.new_editais or 0,
+            'error': self.error
+        }
+
+class ScrapeSourceResult(db.Model):
+    """Resultado de uma fonte em uma execução do scraper"""
+    __tablename__ = 'scrape_source_results'
+    __table_args__ = (
+        db.Index('ix_scrape_source_results_run_id', 'run_id'),
+        # Histórico de uma fonte, mais recente primeiro
+        db.Index('ix_scrape_source_results_source_started', 'source_id', 'started_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('scrape_runs.id', ondelete='CASCADE'), nullable=False)
+    # Nome copiado: o histórico continua legível se a fonte for excluída
+    source_id = db.Column(db.Integer, db.ForeignKey('sources.id', ondelete='SET NULL'))
+    source_name = db.Column(db.String(100), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    http_status = db.Column(db.Integer)
+    bytes = db.Column(db.Integer)
+    not_modified = db.Column(db.Boolean, default=False)
+    entries_seen = db.Column(db.Integer, default=0)
+    entries_relevant = db.Column(db.Integer, default=0)
+    new_editais = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'run_id': self.run_id,
+            'source_id': self.source_id,
+            'source_name': self.source_name,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration': (self.finished_at - self.started_at).total_seconds() if self.finished_at else None,
+            'http_status': self.http_status,
+            'bytes': self.bytes,
+            'not_modified': bool(self.not_modified),
+            'entries_seen': self.entries_seen or 0,
+            'entries_relevant': self.entries_relevant or 0,
+            'new_editais': self.new_editais or 0,
+            'error': self.error
+        }
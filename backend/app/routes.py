@@ -1,15 +1,25 @@
-from flask import Blueprint, jsonify, request
-from .models import Edital, Source, db
+from flask import Blueprint, Response, jsonify, request
+from .models import Edital, ScrapeRun, ScrapeSourceResult, Source, db
+from .search import build_match_query, search_subquery
+from .cache import cached_response
+from .metrics import scrape_metrics
+from .http_client import http_client
+from .html_parser import make_soup
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import and_, false, or_, tuple_
+from sqlalchemy.orm import load_only
 from urllib.parse import urlparse
 import requests
 import feedparser
-from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional
+import base64
+import json
+from typing import Dict, Any, List, Optional
 
 main_bp = Blueprint('main', __name__)
 
+# Tamanho máximo de página aceito em /api/editais?limit=
+MAX_PAGE_SIZE = 200
+
 def validate_url(url: str, source_type: str) -> tuple[bool, str]:
     """Validate URL and check if it's accessible and matches the source type"""
     try:
@@ -18,15 +28,10 @@ def validate_url(url: str, source_type: str) -> tuple[bool, str]:
         if not all([parsed.scheme, parsed.netloc]):
             return False, "URL inválida"
             
-        # Try to access the URL
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         # For RSS sources, try to parse the feed directly
         if source_type == 'rss':
             # First try to get the content
-            response = requests.get(url, headers=headers, timeout=10, verify=False)
+            response = http_client.get(url)
             response.raise_for_status()
             
             # Try to parse as RSS/Atom feed
@@ -47,7 +52,7 @@ def validate_url(url: str, source_type: str) -> tuple[bool, str]:
             return False, "URL não parece ser um feed RSS/Atom válido"
             
         # For web sources, just check if the URL is accessible
-        response = requests.head(url, headers=headers, timeout=5, verify=False)
+        response = http_client.head(url)
         response.raise_for_status()
         return True, ""
         
@@ -59,13 +64,9 @@ def validate_url(url: str, source_type: str) -> tuple[bool, str]:
 def get_url_preview(url: str, source_type: str) -> tuple[bool, str, Optional[Dict[str, Any]]]:
     """Get preview information for a URL"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         if source_type == 'rss':
             # First try to get the content
-            response = requests.get(url, headers=headers, timeout=10, verify=False)
+            response = http_client.get(url)
             response.raise_for_status()
             
             # Try to parse as RSS/Atom feed
@@ -109,10 +110,10 @@ def get_url_preview(url: str, source_type: str) -> tuple[bool, str, Optional[Dic
             }
         
         else:  # Web page
-            response = requests.get(url, headers=headers, timeout=5, verify=False)
+            response = http_client.get(url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             
             # Get page title
             title = soup.title.string if soup.title else url
@@ -143,7 +144,96 @@ def get_url_preview(url: str, source_type: str) -> tuple[bool, str, Optional[Dic
     except Exception as e:
         return False, f"Erro ao obter preview: {str(e)}", None
 
+def encode_cursor(sort_key: Any, edital_id: int) -> str:
+    """Gera o cursor opaco que aponta para o último edital de uma página"""
+    if isinstance(sort_key, datetime):
+        sort_key = sort_key.isoformat()
+    payload = json.dumps([sort_key, edital_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str, by_rank: bool = False) -> tuple[Any, int]:
+    """Converte o cursor de volta em (chave de ordenação, id)
+
+    A chave é a data_publicacao na listagem normal e o rank bm25 na busca.
+    """
+    sort_key, edital_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if by_rank:
+        return float(sort_key), int(edital_id)
+    return datetime.fromisoformat(sort_key), int(edital_id)
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Valida o parâmetro fields= e retorna a lista de campos pedidos"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    invalid = [field for field in requested if field not in Edital.PUBLIC_FIELDS]
+    if invalid:
+        raise ValueError(f"Campos inválidos: {', '.join(invalid)}")
+    # O id sempre acompanha a resposta para o cliente identificar o edital
+    return ['id'] + [field for field in requested if field != 'id']
+
+def build_editais_query(categoria: Optional[str] = None, search: Optional[str] = None,
+                        data_inicio: Optional[datetime] = None,
+                        data_fim: Optional[datetime] = None,
+                        cursor: Optional[tuple[Any, int]] = None,
+                        limit: Optional[int] = None,
+                        fields: Optional[List[str]] = None):
+    """Monta o SELECT de editais para os filtros da listagem
+
+    Cada linha traz (Edital, sort_key); sort_key é a data de publicação ou,
+    quando há busca textual, o rank bm25 do índice FTS5.
+    """
+    match_query = build_match_query(search) if search else None
+    
+    if match_query:
+        busca = search_subquery(match_query)
+        query = db.select(Edital, busca.c.rank.label('sort_key'))\
+            .join(busca, busca.c.edital_id == Edital.id)
+    else:
+        query = db.select(Edital, Edital.data_publicacao.label('sort_key'))
+        if search:
+            # Busca sem nenhum termo pesquisável não casa com nenhum edital
+            query = query.where(false())
+    
+    # Carrega só as colunas pedidas (id e data_publicacao sustentam o cursor)
+    if fields:
+        columns = {'id', 'data_publicacao', *fields}
+        query = query.options(load_only(*[getattr(Edital, column) for column in columns]))
+    
+    # Apply filters
+    if categoria:
+        query = query.where(Edital.categoria == categoria)
+    
+    if data_inicio:
+        query = query.where(Edital.data_vencimento >= data_inicio)
+    
+    if data_fim:
+        query = query.where(Edital.data_vencimento <= data_fim)
+    
+    if match_query:
+        # Mais relevantes primeiro (bm25 menor = melhor)
+        if cursor:
+            rank, edital_id = cursor
+            query = query.where(or_(
+                busca.c.rank > rank,
+                and_(busca.c.rank == rank, Edital.id < edital_id)
+            ))
+        query = query.order_by(busca.c.rank, Edital.id.desc())
+    else:
+        # Keyset: continua depois do último (data_publicacao, id) da página anterior
+        if cursor:
+            query = query.where(tuple_(Edital.data_publicacao, Edital.id) < tuple_(*cursor))
+        
+        # Order by publication date (id desempata para a paginação ser estável)
+        query = query.order_by(Edital.data_publicacao.desc(), Edital.id.desc())
+    
+    if limit:
+        query = query.limit(limit)
+    
+    return query
+
 @main_bp.route('/api/editais', methods=['GET'])
+@cached_response
 def get_editais():
     try:
         # Get query parameters
@@ -154,46 +244,71 @@ def get_editais():
         
         print(f"[DEBUG] Recebendo requisição GET /api/editais com parâmetros: categoria={categoria}, search={search}, data_inicio={data_inicio}, data_fim={data_fim}")
         
-        # Start with base query
-        query = Edital.query
-        
-        # Apply filters
-        if categoria:
-            query = query.filter(Edital.categoria == categoria)
-        
-        if search:
-            search_filter = or_(
-                Edital.nome.ilike(f'%{search}%'),
-                Edital.descricao.ilike(f'%{search}%')
-            )
-            query = query.filter(search_filter)
-        
         if data_inicio:
             try:
                 data_inicio = datetime.fromisoformat(data_inicio)
-                query = query.filter(Edital.data_vencimento >= data_inicio)
             except ValueError as e:
                 print(f"[ERROR] Erro ao converter data_inicio: {str(e)}")
-                pass
+                data_inicio = None
         
         if data_fim:
             try:
                 data_fim = datetime.fromisoformat(data_fim)
-                query = query.filter(Edital.data_vencimento <= data_fim)
             except ValueError as e:
                 print(f"[ERROR] Erro ao converter data_fim: {str(e)}")
-                pass
+                data_fim = None
+        
+        # Paginação e projeção de campos
+        try:
+            limit = request.args.get('limit', type=int)
+            if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+                return jsonify({'error': f'limit deve estar entre 1 e {MAX_PAGE_SIZE}'}), 400
+            cursor = request.args.get('cursor')
+            cursor = decode_cursor(cursor, by_rank=bool(build_match_query(search))) if cursor else None
+            fields = parse_fields(request.args.get('fields'))
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': f'Parâmetro inválido: {str(e)}'}), 400
         
-        # Order by publication date
-        editais = query.order_by(Edital.data_publicacao.desc()).all()
-        print(f"[DEBUG] Encontrados {len(editais)} editais")
+        # Busca um registro a mais para saber se existe próxima página
+        query = build_editais_query(
+            categoria, search, data_inicio, data_fim,
+            cursor=cursor,
+            limit=limit + 1 if limit else None,
+            fields=fields
+        )
+        rows = db.session.execute(query).all()
+        print(f"[DEBUG] Encontrados {len(rows)} editais")
         
-        return jsonify([edital.to_dict() for edital in editais])
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            last_edital, last_sort_key = rows[-1]
+            next_cursor = encode_cursor(last_sort_key, last_edital.id)
+        
+        response = jsonify([edital.to_dict(fields) for edital, _ in rows])
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     except Exception as e:
         print(f"[ERROR] Erro ao buscar editais: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@main_bp.route('/api/editais/<int:edital_id>', methods=['GET'])
+@cached_response
+def get_edital(edital_id):
+    """Get a single edital with all fields"""
+    try:
+        print(f"[DEBUG] Recebendo requisição GET /api/editais/{edital_id}")
+        edital = db.get_or_404(Edital, edital_id)
+        return jsonify(edital.to_dict())
+    except Exception as e:
+        if hasattr(e, 'code') and e.code == 404:
+            return jsonify({'error': 'Edital não encontrado'}), 404
+        print(f"[ERROR] Erro ao buscar edital: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @main_bp.route('/api/categorias', methods=['GET'])
+@cached_response
 def get_categorias():
     try:
         print("[DEBUG] Recebendo requisição GET /api/categorias")
@@ -229,6 +344,75 @@ def get_categorias():
         print(f"[ERROR] Erro ao buscar categorias: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@main_bp.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Métricas do scraper neste processo, no formato texto do Prometheus"""
+    return Response(scrape_metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+# Tamanho máximo de página aceito nos endpoints de histórico do scraper
+MAX_HISTORY_SIZE = 200
+
+def history_limit(default: int = 20) -> int:
+    return max(1, min(request.args.get('limit', default, type=int) or default, MAX_HISTORY_SIZE))
+
+@main_bp.route('/api/scrape-runs', methods=['GET'])
+def get_scrape_runs():
+    """Execuções do scraper, mais recentes primeiro"""
+    try:
+        runs = ScrapeRun.query.order_by(ScrapeRun.started_at.desc()).limit(history_limit()).all()
+        return jsonify([run.to_dict() for run in runs])
+    except Exception as e:
+        print(f"[ERROR] Erro ao buscar execuções do scraper: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@main_bp.route('/api/scrape-runs/<int:run_id>', methods=['GET'])
+def get_scrape_run(run_id):
+    """Uma execução com o resultado de cada fonte"""
+    try:
+        run = db.get_or_404(ScrapeRun, run_id)
+        results = ScrapeSourceResult.query.filter_by(run_id=run_id)\
+            .order_by(ScrapeSourceResult.started_at).all()
+        return jsonify(dict(run.to_dict(), results=[result.to_dict() for result in results]))
+    except Exception as e:
+        if hasattr(e, 'code') and e.code == 404:
+            return jsonify({'error': 'Execução não encontrada'}), 404
+        print(f"[ERROR] Erro ao buscar execução do scraper: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@main_bp.route('/api/sources/<int:source_id>/history', methods=['GET'])
+def get_source_history(source_id):
+    """Últimos resultados de uma fonte e um resumo deles (taxa de erro, duração, volume)"""
+    try:
+        source = db.get_or_404(Source, source_id)
+        results = ScrapeSourceResult.query.filter_by(source_id=source_id)\
+            .order_by(ScrapeSourceResult.started_at.desc())\
+            .limit(history_limit(50)).all()
+        
+        durations = [(r.finished_at - r.started_at).total_seconds() for r in results if r.finished_at]
+        sizes = [r.bytes for r in results if r.bytes is not None]
+        errors = sum(1 for r in results if r.error)
+        summary = {
+            'results': len(results),
+            'errors': errors,
+            'error_rate': errors / len(results) if results else None,
+            'not_modified': sum(1 for r in results if r.not_modified),
+            'avg_duration': sum(durations) / len(durations) if durations else None,
+            'max_duration': max(durations) if durations else None,
+            'avg_bytes': sum(sizes) / len(sizes) if sizes else None,
+            'entries_relevant': sum(r.entries_relevant or 0 for r in results),
+            'new_editais': sum(r.new_editais or 0 for r in results),
+        }
+        return jsonify({
+            'source': source.to_dict(),
+            'summary': summary,
+            'results': [result.to_dict() for result in results]
+        })
+    except Exception as e:
+        if hasattr(e, 'code') and e.code == 404:
+            return jsonify({'error': 'Fonte não encontrada'}), 404
+        print(f"[ERROR] Erro ao buscar histórico da fonte: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # Source management endpoints
 @main_bp.route('/api/sources', methods=['GET'])
 def get_sources():
@@ -342,6 +526,9 @@ def update_source(source_id):
         if 'type' in data:
             source.type = data['type']
         if 'active' in data:
+            if data['active'] and not source.active:
+                # Reativada manualmente: a contagem de falhas recomeça
+                source.consecutive_failures = 0
             source.active = data['active']
             
         db.session.commit()
@@ -0,0 +1,136 @@
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import db
+from .models import SchedulerLease
+
+SCRAPE_JOB = 'scrape'
+
+class ScrapeScheduler:
+    """Dono único do job de scraping.
+
+    A cada ``SCRAPER_INTERVAL_MINUTES`` verifica quais fontes já venceram a
+    próxima coleta (a agenda de cada fonte é adaptativa, ver
+    Source.register_poll) e protege cada execução com um lease
+    na tabela scheduler_leases: se outro processo (outro worker do servidor,
+    o processo do reloader ou o worker dedicado) estiver executando, a
+    execução atual é pulada em vez de rodar em paralelo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = logging.getLogger(__name__)
+        self.interval_minutes = app.config['SCRAPER_INTERVAL_MINUTES']
+        self.lease_seconds = app.config['SCRAPER_LEASE_SECONDS']
+        # Prefixo do dono; cada execução acrescenta seu próprio token (ver run_once)
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self.scheduler = None
+
+    def start(self):
+        """Inicia o agendamento em background; a primeira execução não bloqueia o startup"""
+        self.scheduler = BackgroundScheduler()
+        self._add_job(self.scheduler)
+        self.scheduler.start()
+        self.logger.info(f"Scrape scheduler started (every {self.interval_minutes} min)")
+
+    def run_forever(self):
+        """Executa o agendamento no processo atual (modo worker)"""
+        self.scheduler = BlockingScheduler()
+        self._add_job(self.scheduler)
+        self.logger.info(f"Scrape worker started (every {self.interval_minutes} min)")
+        try:
+            self.scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+
+    def shutdown(self):
+        if self.scheduler and self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+    def _add_job(self, scheduler):
+        scheduler.add_job(
+            self.run_once,
+            'interval',
+            minutes=self.interval_minutes,
+            id=SCRAPE_JOB,
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+
+    def run_once(self, due_only: bool = True) -> Optional[int]:
+        """Executa um ciclo de scraping se o lease estiver livre
+
+        O agendador só coleta as fontes vencidas (``due_only``); a atualização
+        manual coleta todas. Retorna o número de novos editais, ou None se
+        outro processo já estiver executando o scraper.
+        """
+        from .scraper import EditalScraper
+
+        with self.app.app_context():
+            token = self.acquire_lease()
+            if token is None:
+                self.logger.info("Scrape already running, skipping")
+                return None
+            try:
+                scraper = EditalScraper(self.app)
+                num_new = scraper.parse_sources(due_only=due_only)
+                self.logger.info(f"Scheduled scraping completed. Added {num_new} new editais.")
+                # Editais já salvos cujas páginas podem ter mudado (prazo prorrogado etc.)
+                scraper.recheck_editais()
+                return num_new
+            except Exception as e:
+                self.logger.error(f"Error in scheduled scraping: {str(e)}")
+                return 0
+            finally:
+                self.release_lease(token)
+
+    def acquire_lease(self) -> Optional[str]:
+        """Tenta obter o lease do job de forma atômica
+
+        Retorna o token desta execução, ou None se o lease estiver com outra.
+        O token é por execução, não por processo: a atualização manual
+        (/api/update-feeds) e o agendador do mesmo processo também se excluem.
+        """
+        token = f'{self.owner}:{uuid.uuid4().hex[:8]}'
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        stmt = sqlite_insert(SchedulerLease.__table__).values(
+            name=SCRAPE_JOB, owner=token, acquired_at=now, expires_at=expires_at
+        )
+        # Só sobrescreve um lease expirado (dono morreu no meio da execução)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['name'],
+            set_={
+                'owner': stmt.excluded.owner,
+                'acquired_at': stmt.excluded.acquired_at,
+                'expires_at': stmt.excluded.expires_at,
+            },
+            where=SchedulerLease.__table__.c.expires_at < now
+        )
+        try:
+            result = db.session.execute(stmt)
+            db.session.commit()
+            return token if result.rowcount > 0 else None
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error acquiring scheduler lease: {str(e)}")
+            return None
+
+    def release_lease(self, token: str):
+        """Libera o lease só se ele ainda for desta execução"""
+        try:
+            SchedulerLease.query.filter_by(name=SCRAPE_JOB, owner=token).delete()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error releasing scheduler lease: {str(e)}")
@@ -1,33 +1,68 @@
 import feedparser
-from bs4 import BeautifulSoup
-import requests
 from datetime import datetime, timedelta
-from .models import Edital, Source, db
+from .models import Edital, ScrapeRun, ScrapeSourceResult, Source, db
 from flask import current_app
 import re
 from typing import List, Dict, Optional, Any, Tuple
-from urllib.parse import urljoin
-import urllib3
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+from urllib.parse import urljoin, urlparse
+from collections import Counter
+from concurrent.futures import Future, as_completed
+from contextlib import ExitStack
+from functools import partial
+import hashlib
 import html
 from dateutil import parser as date_parser
 import logging
+import requests
+import threading
 import time
-
-# Desabilitar avisos SSL
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from .fetcher import AsyncFeedFetcher
+from .http_client import CircuitOpenError, http_client
+from .html_parser import make_soup
+from .dates import extract_date, extract_scored_date
+from . import keywords
+from .workers import scrape_pool
+from .writer import db_writer
+from .cache import response_cache
+from .metrics import ScrapeMetrics, scrape_metrics
+from sqlalchemy import delete, or_, select, update as update_stmt
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 class ContentExtractor:
-    """Classe base para diferentes estratégias de extração de conteúdo"""
-    def extract(self, url: str) -> Tuple[str, Optional[datetime]]:
+    """Classe base para diferentes estratégias de extração de conteúdo
+
+    ``config`` é o Source.config da fonte; ``timeout`` (segundos) vale
+    para todos os extratores. Os extratores são compartilhados entre as
+    threads do pool, então o status e o tamanho da última resposta ficam
+    por thread (ver last_fetch).
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def extract(self, url: str, config: Optional[Dict] = None) -> List[Dict]:
         raise NotImplementedError
 
+    def fetch(self, url: str, config: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """GET pelo http_client; status de erro (404, 500...) levanta HTTPError"""
+        response = http_client.get(url, **kwargs, **self.request_options(config))
+        self._local.last_fetch = {'http_status': response.status_code, 'bytes': len(response.content)}
+        response.raise_for_status()
+        return response
+
+    def last_fetch(self) -> Dict[str, Any]:
+        """Status HTTP e bytes da última resposta obtida por esta thread"""
+        return getattr(self._local, 'last_fetch', None) or {}
+
+    @staticmethod
+    def request_options(config: Optional[Dict]) -> Dict[str, Any]:
+        timeout = (config or {}).get('timeout')
+        return {'timeout': timeout} if timeout else {}
+
 class RSSExtractor(ContentExtractor):
     """Extrai conteúdo de feeds RSS padrão"""
-    def extract(self, url: str) -> Tuple[str, Optional[datetime]]:
-        feed = feedparser.parse(url)
+    def extract(self, url: str, config: Optional[Dict] = None) -> List[Dict]:
+        response = self.fetch(url, config)
+        feed = feedparser.parse(response.content)
         entries = []
         for entry in feed.entries:
             title = entry.get('title', '')
@@ -46,13 +81,13 @@ class RSSExtractor(ContentExtractor):
 
 class GovBrExtractor(ContentExtractor):
     """Extrator específico para o site do governo"""
-    def extract(self, url: str) -> List[Dict]:
+    def extract(self, url: str, config: Optional[Dict] = None) -> List[Dict]:
         # Remove /RSS do final da URL se presente
         base_url = url.replace('/RSS', '')
         
         # Faz request para a página
-        response = requests.get(base_url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = self.fetch(base_url, config)
+        soup = make_soup(response.text)
         
         entries = []
         # Encontra todas as notícias na página
@@ -94,9 +129,9 @@ class GovBrExtractor(ContentExtractor):
 
 class WebPageExtractor(ContentExtractor):
     """Extrai conteúdo de páginas web genéricas"""
-    def extract(self, url: str) -> List[Dict]:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+    def extract(self, url: str, config: Optional[Dict] = None) -> List[Dict]:
+        response = self.fetch(url, config)
+        soup = make_soup(response.text)
         
         # Remove tags desnecessárias
         for tag in soup(['script', 'style']):
@@ -135,18 +170,26 @@ class WebPageExtractor(ContentExtractor):
         return [{
             'title': soup.title.string if soup.title else '',
             'description': text[:500],
+            'content': text,
             'link': url,
-            'date': date
+            'date': date,
+            # A entrada é a própria página já baixada: não precisa de outro download
+            'full_content': True
         }]
 
 class APIExtractor(ContentExtractor):
     """Extrai conteúdo de APIs REST"""
     def __init__(self, headers=None, params=None):
+        super().__init__()
         self.headers = headers or {}
         self.params = params or {}
         
-    def extract(self, url: str) -> List[Dict]:
-        response = requests.get(url, headers=self.headers, params=self.params)
+    def extract(self, url: str, config: Optional[Dict] = None) -> List[Dict]:
+        # Cabeçalhos e parâmetros da fonte (ex.: chave de API) completam os padrões
+        config = config or {}
+        headers = {**self.headers, **config.get('headers', {})}
+        params = {**self.params, **config.get('params', {})}
+        response = self.fetch(url, config, headers=headers, params=params)
         data = response.json()
         
         # Implementação base - deve ser customizada para cada API
@@ -188,9 +231,33 @@ class APIExtractor(ContentExtractor):
         return entries
 
 class EditalScraper:
+    # Parâmetros por comando no SQLite anterior à 3.32; o tamanho de cada
+    # INSERT em lote sai daqui e do número de colunas
+    SQLITE_MAX_VARIABLES = 999
+
+    # Limite global de downloads simultâneos de feeds
+    FEED_CONCURRENCY = 20
+
     def __init__(self, app=None):
         self.app = app
         self.logger = logging.getLogger(__name__)
+        self.http = http_client
+        self.pool = scrape_pool
+        # Limite de bytes lidos por página de artigo
+        self.max_page_bytes = app.config.get('SCRAPER_MAX_PAGE_BYTES', 2 * 1024 * 1024) if app else 2 * 1024 * 1024
+        # O limite por host acompanha o tamanho do pool de conexões por host
+        self.fetcher = AsyncFeedFetcher(
+            self.http,
+            max_concurrency=self.FEED_CONCURRENCY,
+            per_host=self.http.pool_per_host
+        )
+        # Páginas baixadas vs. entradas resolvidas só com os dados do feed
+        self.stats = Counter()
+        # Tempo por etapa e por fonte desta execução (também somado em /api/metrics)
+        self.metrics = ScrapeMetrics(parent=scrape_metrics)
+        # Execução atual (scrape_runs) e resultado de cada fonte nela, por Source.id
+        self.run_id: Optional[int] = None
+        self.results: Dict[int, Dict[str, Any]] = {}
         self.extractors = {
             'rss': RSSExtractor(),
             'govbr': GovBrExtractor(),
@@ -214,31 +281,11 @@ class EditalScraper:
     def parse_source(self, source: Source) -> List[Dict]:
         """Processa uma fonte e retorna os editais encontrados"""
         try:
-            extractor = self.get_extractor(source)
-            entries = extractor.extract(source.url)
-            
-            editais = []
-            for entry in entries:
-                edital = {
-                    'nome': entry['title'],
-                    'descricao': entry['description'],
-                    'link': entry['link'],
-                    'fonte': source.name,
-                    'data_publicacao': entry['date'] or datetime.now()
-                }
-                
-                # Tenta extrair data de vencimento e categoria
-                data_vencimento = self.extract_data_vencimento(entry['description'])
-                if data_vencimento:
-                    edital['data_vencimento'] = data_vencimento
-                    
-                categoria = self.extract_categoria(entry['description'])
-                if categoria:
-                    edital['categoria'] = categoria
-                    
-                editais.append(edital)
-                
-            return editais
+            if source.type == 'rss':
+                return self.parse_rss_feed(source)
+            (_, future), = self.submit_extractions([source])
+            entries, _ = future.result()
+            return self.collect_feed_results(source, self.submit_extracted_entries(source, entries))
             
         except Exception as e:
             self.logger.error(f"Erro ao processar fonte {source.name}: {str(e)}")
@@ -254,23 +301,6 @@ class EditalScraper:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
 
-    def _create_session(self) -> requests.Session:
-        """Cria uma sessão HTTP com retry e timeouts apropriados"""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        session.verify = False
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        return session
-
     def clean_text(self, text: str) -> str:
         """Limpa e formata o texto removendo espaços extras e caracteres especiais"""
         if not text:
@@ -285,74 +315,28 @@ class EditalScraper:
         return text.strip()
 
     def extract_date(self, text: str) -> Optional[datetime]:
-        """Extrai data do texto usando vários formatos"""
-        if not text:
-            return None
-            
-        # Lista de padrões de data comuns em português
-        date_patterns = [
-            r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',  # dd/mm/yyyy ou dd-mm-yyyy
-            r'(\d{1,2})\s+de\s+([^\s]+)\s+de\s+(\d{2,4})',  # dd de mês de yyyy
-            r'até\s+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',  # até dd/mm/yyyy
-            r'prazo[:\s]+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',  # prazo: dd/mm/yyyy
-            r'encerramento[:\s]+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',  # encerramento: dd/mm/yyyy
-            r'vencimento[:\s]+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',  # vencimento: dd/mm/yyyy
-        ]
-
-        # Mapeamento de nomes de meses em português
-        month_names = {
-            'janeiro': 1, 'fevereiro': 2, 'março': 3, 'abril': 4,
-            'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
-            'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
-            'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
-            'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12
-        }
-
-        text = text.lower()
-        
-        # Tenta cada padrão de data
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                try:
-                    if len(match.groups()) == 3:
-                        day, month, year = match.groups()
-                        
-                        # Converte mês por extenso para número
-                        if month.isalpha():
-                            if month not in month_names:
-                                continue
-                            month = month_names[month]
-                        
-                        # Converte para inteiros
-                        day = int(day)
-                        month = int(month)
-                        year = int(year)
-                        
-                        # Ajusta o ano se necessário
-                        if year < 100:
-                            year += 2000 if year < 50 else 1900
-                        
-                        # Valida a data
-                        try:
-                            date = datetime(year, month, day)
-                            # Ignora datas muito antigas ou muito futuras
-                            if date.year >= 2020 and date.year <= 2030:
-                                return date
-                        except ValueError:
-                            continue
-                except (ValueError, AttributeError) as e:
-                    self.logger.warning(f"Error parsing date: {str(e)}")
-                    continue
-                    
-        return None
+        """Extrai data do texto usando vários formatos (ver app.dates)"""
+        return extract_date(text)
 
     def get_full_content(self, url: str) -> Tuple[Optional[str], Optional[datetime]]:
         """Obtém o conteúdo completo de uma URL com melhor tratamento de erros"""
+        return self.parse_page(self.fetch_page(url), url)
+
+    def fetch_page(self, url: str) -> Optional[str]:
+        """Baixa o HTML de uma página (etapa de download do pipeline)"""
+        return self.fetch_page_result(url)['html']
+
+    def fetch_page_result(self, url: str, etag: Optional[str] = None,
+                          last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """Baixa uma página, condicionalmente se houver validadores da última vez
+
+        Retorna html (None em erro, 304 ou conteúdo não HTML), not_modified e
+        os validadores novos enviados pelo servidor.
+        """
+        result = {'html': None, 'not_modified': False, 'etag': etag, 'last_modified': last_modified}
         try:
             # Configura headers para simular um navegador
             headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
                 'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
                 'Accept-Encoding': 'gzip, deflate, br',
@@ -363,35 +347,52 @@ class EditalScraper:
                 'Sec-Fetch-User': '?1',
                 'Sec-Fetch-Dest': 'document',
             }
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
 
-            # Tenta fazer a requisição com retry e timeout
-            for attempt in range(3):
-                try:
-                    response = self.session.get(
-                        url, 
-                        headers=headers,
-                        timeout=10,
-                        verify=False
-                    )
-                    
-                    # Se for erro 520 ou outro erro do servidor, tenta próxima tentativa
-                    if response.status_code in [520, 502, 503, 504]:
-                        if attempt < 2:  # Se não for a última tentativa
-                            time.sleep(1)  # Espera 1 segundo antes de tentar novamente
-                            continue
-                    
-                    response.raise_for_status()
-                    break
-                except (requests.RequestException, TimeoutError) as e:
-                    if attempt == 2:  # Se for a última tentativa
-                        raise e
-                    time.sleep(1)
+            # Retry (só para erros transitórios) e circuit breaker ficam no http_client
+            # stream=True: o corpo só é lido (e limitado) em read_limited
+            response = self.http.get(url, headers=headers, stream=True, max_bytes=self.max_page_bytes)
+            try:
+                if response.status_code == 304:
+                    result['not_modified'] = True
+                    return result
+                response.raise_for_status()
+                result['etag'] = response.headers.get('ETag')
+                result['last_modified'] = response.headers.get('Last-Modified')
+                result['html'] = self.http.read_limited(response, self.max_page_bytes)
+                return result
+            finally:
+                response.close()
             
+        except CircuitOpenError as e:
+            # Host fora do ar: falha na hora, sem poluir o log com um erro por entrada
+            self.logger.debug(f"Skipping {url}: {str(e)}")
+            return result
+        except Exception as e:
+            self.logger.error(f"Error getting content from {url}: {str(e)}")
+            return result
+
+    @staticmethod
+    def hash_content(content: Optional[str]) -> Optional[str]:
+        """Hash do texto principal normalizado (caixa e espaços não contam como mudança)"""
+        if not content:
+            return None
+        normalized = ' '.join(content.lower().split())
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def parse_page(self, page_html: Optional[str], url: str = '') -> Tuple[Optional[str], Optional[datetime]]:
+        """Extrai texto principal e data de uma página já baixada (etapa de parse)"""
+        if not page_html:
+            return None, None
+        try:
             # Parse do conteúdo
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(page_html)
             
-            # Remove elementos desnecessários
-            for elem in soup.select('script, style, nav, header, footer, iframe'):
+            # Remove elementos desnecessários (find_all por nome evita o soupsieve)
+            for elem in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'iframe']):
                 elem.decompose()
             
             # Extrai o texto principal
@@ -443,29 +444,98 @@ class EditalScraper:
             return content, date
             
         except Exception as e:
-            self.logger.error(f"Error getting content from {url}: {str(e)}")
+            self.logger.error(f"Error parsing content from {url}: {str(e)}")
             return None, None
 
-    def process_feed_entries(self, entries: List[Any], source: Source) -> List[Dict[str, Any]]:
+    def get_entry_link(self, entry: Any, source: Source) -> str:
+        """Retorna o link absoluto de uma entrada do feed"""
+        link = ""
+        if hasattr(entry, 'link') and entry.link:
+            link = entry.link
+            if not link.startswith(('http://', 'https://')):
+                link = urljoin(source.url, link)
+        return link
+
+    def load_known_links(self, links: List[str]) -> set:
+        """Retorna, com uma única consulta, quais links já estão cadastrados"""
+        links = list({link for link in links if link})
+        if not links:
+            return set()
+        rows = db.session.query(Edital.link).filter(Edital.link.in_(links)).all()
+        return {row[0] for row in rows}
+
+    def insert_editais(self, editais: List[Dict[str, Any]], session) -> int:
+        """Insere editais em lote, ignorando links já existentes, e retorna quantos entraram
+
+        Roda dentro de um job do db_writer, com a sessão dele.
+        """
+        # Remove duplicados dentro do próprio lote
+        rows = list({edital['link']: edital for edital in editais}.values())
+        if not rows:
+            return 0
+        
+        columns = ['nome', 'link', 'descricao', 'data_vencimento',
+                   'data_publicacao', 'categoria', 'fonte', 'content_hash',
+                   'page_etag', 'page_last_modified', 'checked_at']
+        now = datetime.utcnow()
+        # +1: created_at
+        batch_size = self.SQLITE_MAX_VARIABLES // (len(columns) + 1)
+        inserted = 0
+        for i in range(0, len(rows), batch_size):
+            batch = [
+                dict({column: row.get(column) for column in columns}, created_at=now)
+                for row in rows[i:i + batch_size]
+            ]
+            stmt = sqlite_insert(Edital.__table__).values(batch)
+            # Outra execução concorrente pode ter inserido o mesmo link
+            stmt = stmt.on_conflict_do_nothing(index_elements=['link'])
+            result = session.execute(stmt)
+            inserted += max(result.rowcount, 0)
+        return inserted
+
+    def process_feed_entries(self, entries: List[Any], source: Source,
+                             known_links: Optional[set] = None) -> List[Dict[str, Any]]:
         """Processa múltiplas entradas do feed mantendo o contexto da aplicação"""
         editais = []
         with self.app.app_context():
             for entry in entries:
                 try:
-                    result = self.process_feed_entry(entry, source)
+                    result = self.process_feed_entry(entry, source, known_links)
                     if result:
                         editais.append(result)
                 except Exception as e:
                     self.logger.error(f"Error processing entry: {str(e)}")
         return editais
 
-    def process_feed_entry_with_context(self, entry: Any, source: Source) -> Optional[Dict[str, Any]]:
+    def process_feed_entry_with_context(self, entry: Any, source: Source,
+                                        known_links: Optional[set] = None) -> Optional[Dict[str, Any]]:
         """Wrapper para processar entrada com contexto da aplicação"""
         with self.app.app_context():
-            return self.process_feed_entry(entry, source)
+            return self.process_feed_entry(entry, source, known_links)
 
-    def process_feed_entry(self, entry: Any, source: Source) -> Optional[Dict[str, Any]]:
+    def process_feed_entry(self, entry: Any, source: Source,
+                           known_links: Optional[set] = None) -> Optional[Dict[str, Any]]:
         """Processa uma entrada do feed RSS"""
+        prepared = self.prepare_feed_entry(entry, source, known_links)
+        if not prepared:
+            return None
+        if not self.needs_page(prepared):
+            return self.build_edital(prepared, None)
+        return self.build_edital(prepared, self.fetch_page_result(prepared['link']))
+
+    def needs_page(self, prepared: Dict[str, Any]) -> bool:
+        """Nível 2: só baixa a página se o feed não informar prazo ou categoria"""
+        # Data sem palavra de prazo (ex.: "Publicado em") não conta como prazo
+        needed = not prepared['full_content'] and (
+            not prepared['feed_deadline'] or prepared['feed_categoria'] is None
+        )
+        self.stats['pages_fetched' if needed else 'pages_skipped'] += 1
+        self.metrics.inc('pages_fetched' if needed else 'pages_skipped', prepared['fonte'])
+        return needed
+
+    def prepare_feed_entry(self, entry: Any, source: Source,
+                           known_links: Optional[set] = None) -> Optional[Dict[str, Any]]:
+        """Extrai os dados do próprio feed e decide se a entrada merece ser baixada"""
         try:
             # Verifica se entry é None
             if not entry:
@@ -496,34 +566,114 @@ class EditalScraper:
                 except (IndexError, AttributeError) as e:
                     self.logger.warning(f"Error extracting content: {str(e)}")
             
-            # Combina todo o conteúdo para busca
-            full_text = f"{title} {description} {content}".lower()
-            
-            # Verifica relevância com base em palavras-chave
-            if not self.is_relevant_content(full_text):
-                return None
-            
-            # Processa o link com verificação de None
-            link = ""
-            if hasattr(entry, 'link') and entry.link:
-                link = entry.link
-                if not link.startswith(('http://', 'https://')):
-                    link = urljoin(source.url, link)
+            # Prepara a data de publicação
+            published = None
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                try:
+                    published = datetime(*entry.published_parsed[:6])
+                except (TypeError, ValueError) as e:
+                    self.logger.warning(f"Error parsing publication date: {str(e)}")
             
-            if not link:
-                self.logger.warning("Entry has no link, skipping")
+            link = self.get_entry_link(entry, source)
+            return self.prepare_entry(source, title, description, content, link, published, known_links)
+        except Exception as e:
+            self.logger.error(f"Error processing entry: {str(e)}")
+            return None
+
+    def prepare_extracted_entry(self, entry: Dict[str, Any], source: Source,
+                                known_links: Optional[set] = None) -> Optional[Dict[str, Any]]:
+        """Equivalente a prepare_feed_entry para as entradas dos extratores (webpage, api)"""
+        try:
+            title = self.clean_text(entry.get('title') or '')
+            if not title:
+                self.logger.warning("Entry has no title, skipping")
                 return None
+            description = self.clean_text(entry.get('description') or '')
+            link = self.resolve_link(entry.get('link'), source)
+            published = entry.get('date') if isinstance(entry.get('date'), datetime) else None
+            content = self.clean_text(entry.get('content') or '')
+            prepared = self.prepare_entry(source, title, description, content, link, published, known_links)
+            if prepared:
+                prepared['full_content'] = bool(entry.get('full_content'))
+            return prepared
+        except Exception as e:
+            self.logger.error(f"Error processing entry: {str(e)}")
+            return None
+
+    @staticmethod
+    def resolve_link(link: Optional[str], source: Source) -> str:
+        """Links relativos dos extratores são resolvidos contra a URL da fonte"""
+        if link and not link.startswith(('http://', 'https://')):
+            return urljoin(source.url, link)
+        return link or ''
+
+    def prepare_entry(self, source: Source, title: str, description: str, content: str,
+                      link: str, published: Optional[datetime],
+                      known_links: Optional[set] = None) -> Optional[Dict[str, Any]]:
+        """Nível 1, comum a todos os tipos de fonte: relevância, prazo e categoria
+        a partir dos metadados, sem nenhum acesso à rede"""
+        # Combina todo o conteúdo para busca
+        full_text = f"{title} {description} {content}".lower()
+        
+        # Relevância e categoria numa única passada pelos metadados
+        with self.metrics.timer('relevance_filter', source.name):
+            hits = keywords.scan(full_text)
+            relevant = keywords.is_relevant(hits)
+        if not relevant:
+            self.metrics.inc('entries_irrelevant', source.name)
+            return None
+        self.count_entries(source, 'entries_relevant')
+        categoria = keywords.categoria(hits)
+        
+        if not link:
+            self.logger.warning("Entry has no link, skipping")
+            return None
+        
+        # Entradas já cadastradas não precisam do download da página completa
+        if known_links is not None and link in known_links:
+            self.metrics.inc('entries_known', source.name)
+            return None
+        self.metrics.inc('entries_new', source.name)
+        
+        # Prazo e categoria que o próprio feed já informa; uma data sem
+        # contexto de prazo só serve de reserva se a página não trouxer outra
+        feed_date, feed_score = None, 0
+        with self.metrics.timer('extract', source.name):
+            for text in (content, description, title):
+                date, score = extract_scored_date(text)
+                if date and (feed_date is None or score > feed_score):
+                    feed_date, feed_score = date, score
+                if feed_score:
+                    break
+        
+        return {
+            'title': title,
+            'description': description,
+            'content': content,
+            'link': link,
+            'published': published,
+            'fonte': source.name,
+            'feed_date': feed_date,
+            'feed_deadline': feed_score > 0,
+            # Entradas de extrator que já são a página completa (WebPageExtractor)
+            'full_content': False,
+            # Genéricas ("Edital") não contam: a página pode dizer a área
+            'feed_categoria': categoria if keywords.is_thematic(categoria) else None
+        }
+
+    def build_edital(self, prepared: Dict[str, Any], page: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Monta o edital a partir dos dados do feed e da página baixada (fetch_page_result)"""
+        try:
+            title = prepared['title']
+            description = prepared['description']
+            page = page or {}
             
-            # Obtém conteúdo completo e possível data
-            content_full = None
-            page_date = None
-            
-            try:
-                content_full, page_date = self.get_full_content(link)
-            except Exception as e:
-                self.logger.warning(f"Error getting full content, using feed content: {str(e)}")
-                # Se falhar ao obter conteúdo completo, usa o conteúdo do feed
-                content_full = description or content or title
+            # Obtém conteúdo completo e possível data (sem página: só dados do feed)
+            content_full, page_date = None, None
+            if page.get('html'):
+                with self.metrics.timer('html_parse', prepared['fonte']):
+                    content_full, page_date = self.parse_page(page['html'], prepared['link'])
+            extract_started = time.perf_counter()
             
             # Determina a data de vencimento com verificações de None
             data_venc = None
@@ -532,8 +682,7 @@ class EditalScraper:
             date_sources = [
                 (page_date, "página"),
                 (self.extract_date(content_full), "conteúdo completo"),
-                (self.extract_date(description), "descrição"),
-                (self.extract_date(title), "título")
+                (prepared['feed_date'], "feed")
             ]
             
             for date, source_name in date_sources:
@@ -543,40 +692,41 @@ class EditalScraper:
                     break
             
             # Tenta usar a data de publicação como fallback
-            if not data_venc and hasattr(entry, 'published_parsed'):
-                try:
-                    if entry.published_parsed:
-                        data_venc = datetime(*entry.published_parsed[:6])
-                        self.logger.info(f"Usando data de publicação: {data_venc}")
-                except (AttributeError, TypeError, ValueError) as e:
-                    self.logger.warning(f"Error parsing published date: {str(e)}")
+            if not data_venc and prepared['published']:
+                data_venc = prepared['published']
+                self.logger.info(f"Usando data de publicação: {data_venc}")
             
             # Se ainda não tem data, usa data atual + 30 dias
             if not data_venc:
                 data_venc = datetime.now() + timedelta(days=30)
                 self.logger.info(f"Usando data padrão: {data_venc}")
             
+            # Categoria temática da página, senão a do feed, senão a genérica
+            categoria = self.extract_categoria(content_full or description)
+            if not keywords.is_thematic(categoria) and prepared['feed_categoria']:
+                categoria = prepared['feed_categoria']
+            self.metrics.observe('extract', prepared['fonte'], time.perf_counter() - extract_started)
+            
             # Prepara a descrição final
             final_description = content_full or description or title
             if final_description and len(final_description) > 500:
                 final_description = final_description[:497] + "..."
             
-            # Prepara a data de publicação
-            data_publicacao = datetime.now()
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                try:
-                    data_publicacao = datetime(*entry.published_parsed[:6])
-                except (TypeError, ValueError) as e:
-                    self.logger.warning(f"Error parsing publication date: {str(e)}")
-            
             return {
                 'nome': title,
-                'link': link,
+                'link': prepared['link'],
                 'descricao': final_description,
                 'data_vencimento': data_venc,
-                'data_publicacao': data_publicacao,
-                'categoria': self.extract_categoria(content_full or description or ""),
-                'fonte': source.name
+                'data_publicacao': prepared['published'] or datetime.now(),
+                'categoria': categoria,
+                'fonte': prepared['fonte'],
+                'content_hash': self.hash_content(content_full),
+                'page_etag': page.get('etag'),
+                'page_last_modified': page.get('last_modified'),
+                # Também sem página (só dados do feed): a primeira reverificação
+                # espera SCRAPER_RECHECK_HOURS, senão o download pulado no
+                # nível 2 aconteceria logo na execução seguinte
+                'checked_at': datetime.utcnow()
             }
         except Exception as e:
             self.logger.error(f"Error processing entry: {str(e)}")
@@ -584,66 +734,32 @@ class EditalScraper:
 
     def is_relevant_content(self, text: str) -> bool:
         """Verifica se o conteúdo é relevante baseado em palavras-chave"""
-        keywords = {
-            # Prioridade alta (precisa ter pelo menos uma)
-            'high_priority': [
-                'edital', 'chamada pública', 'seleção', 'concurso',
-                'prêmio', 'inscrição', 'inscrições'
-            ],
-            # Prioridade média (precisa ter pelo menos duas)
-            'medium_priority': [
-                'cultura', 'cultural', 'arte', 'artista', 'artístico',
-                'música', 'teatro', 'dança', 'cinema', 'literatura',
-                'patrimônio', 'museu', 'biblioteca', 'exposição'
-            ],
-            # Prioridade baixa (aumenta relevância)
-            'low_priority': [
-                'fomento', 'incentivo', 'financiamento', 'patrocínio',
-                'apoio', 'lei rouanet', 'proac', 'fundo', 'recurso'
-            ]
-        }
-        
-        # Verifica palavras de alta prioridade
-        if any(keyword in text for keyword in keywords['high_priority']):
-            return True
-        
-        # Conta palavras de média prioridade
-        medium_count = sum(1 for keyword in keywords['medium_priority'] if keyword in text)
-        if medium_count >= 2:
-            return True
-        
-        # Se tem uma palavra de média prioridade e pelo menos uma de baixa
-        if medium_count >= 1 and any(keyword in text for keyword in keywords['low_priority']):
-            return True
-        
-        return False
+        return keywords.is_relevant(keywords.scan(text))
 
     def parse_rss_feed(self, source: Source) -> List[Dict[str, Any]]:
-        """Parse um feed RSS com melhor tratamento de erros"""
+        """Baixa e processa um único feed RSS"""
+        result = self.fetcher.fetch_all([source])[0]
+        if result['error']:
+            return []
+        return self.process_feed_content(source, result['content'])
+
+    def process_feed_content(self, source: Source, feed_content: Optional[str]) -> List[Dict[str, Any]]:
+        """Parse do conteúdo de um feed RSS já baixado"""
+        return self.collect_feed_results(source, self.submit_feed_content(source, feed_content))
+
+    def submit_feed_content(self, source: Source, feed_content: Optional[str]) -> List[Future]:
+        """Faz o parse do feed e envia as entradas novas para o pool de download/parse"""
         try:
             self.logger.info(f"Iniciando parse do feed: {source.url}")
             
-            # Verifica se a URL é válida
-            if not source.url:
-                self.logger.error("URL da fonte é vazia")
-                return []
-            
-            # Faz a requisição com retry automático
-            try:
-                response = self.session.get(source.url, timeout=15)
-                response.raise_for_status()
-                feed_content = response.text
-            except Exception as e:
-                self.logger.error(f"Erro ao fazer requisição para {source.url}: {str(e)}")
-                return []
-            
             if not feed_content:
                 self.logger.error(f"Conteúdo vazio do feed: {source.url}")
                 return []
             
             # Parse do feed com verificação de erros
             try:
-                feed = feedparser.parse(feed_content)
+                with self.metrics.timer('feed_parse', source.name):
+                    feed = feedparser.parse(feed_content)
             except Exception as e:
                 self.logger.error(f"Erro ao fazer parse do feed {source.url}: {str(e)}")
                 return []
@@ -660,123 +776,505 @@ class EditalScraper:
                 self.logger.info(f"Feed não tem novas entradas: {source.url}")
                 return []
 
-            # Processa entradas em chunks para melhor performance
-            chunk_size = 5
-            all_editais = []
             entries = [e for e in feed.entries if e is not None]
+            self.count_entries(source, 'entries_seen', len(entries))
+            with self.metrics.timer('dedup', source.name):
+                known_links = self.load_known_links(
+                    [self.get_entry_link(entry, source) for entry in entries]
+                )
             
-            for i in range(0, len(entries), chunk_size):
-                chunk = entries[i:i + chunk_size]
-                with ThreadPoolExecutor(max_workers=chunk_size) as executor:
-                    futures = [
-                        executor.submit(self.process_feed_entry_with_context, entry, source)
-                        for entry in chunk
-                    ]
-                    
-                    for future in as_completed(futures):
-                        try:
-                            result = future.result()
-                            if result:
-                                all_editais.append(result)
-                        except Exception as e:
-                            self.logger.error(f"Erro ao processar entrada do feed: {str(e)}")
-            
-            self.logger.info(f"Concluído parse do feed {source.url}. Encontrados {len(all_editais)} editais.")
-            return all_editais
+            return self.submit_prepared(
+                self.prepare_feed_entry(entry, source, known_links) for entry in entries
+            )
             
         except Exception as e:
             self.logger.error(f"Erro ao fazer parse do feed {source.url}: {str(e)}")
             return []
 
-    def parse_rss_feeds(self) -> int:
-        """Parse todos os feeds RSS ativos e retorna o número de novos editais"""
+    def submit_extracted_entries(self, source: Source, entries: List[Dict[str, Any]]) -> List[Future]:
+        """Envia as entradas de um extrator (webpage, api) para o mesmo pipeline dos feeds"""
+        try:
+            self.count_entries(source, 'entries_seen', len(entries))
+            with self.metrics.timer('dedup', source.name):
+                known_links = self.load_known_links([self.resolve_link(entry.get('link'), source) for entry in entries])
+            return self.submit_prepared(
+                self.prepare_extracted_entry(entry, source, known_links) for entry in entries
+            )
+        except Exception as e:
+            self.logger.error(f"Erro ao processar fonte {source.name}: {str(e)}")
+            return []
+
+    def submit_prepared(self, prepared_entries) -> List[Future]:
+        """Nível 2: baixa a página só quando necessário e monta os editais no pool"""
+        # Sem lotes: cada entrada segue pelo pool compartilhado assim que é enviada
+        futures = []
+        for prepared in prepared_entries:
+            if not prepared:
+                continue
+            if self.needs_page(prepared):
+                futures.append(self.pool.submit(
+                    self.metrics.timed('page_fetch', prepared['fonte'],
+                                       partial(self.fetch_page_result, prepared['link'])),
+                    partial(self.build_edital, prepared)
+                ))
+            else:
+                # Os metadados já bastam: monta o edital sem passar pela fila de download
+                future: Future = Future()
+                future.set_result(self.build_edital(prepared, None))
+                futures.append(future)
+        return futures
+
+    def submit_extractions(self, sources: List[Source]) -> List[Tuple[Source, Future]]:
+        """Executa o extrator de cada fonte (webpage, api) em paralelo no pool
+
+        Cada tipo de extrator tem seu próprio limite de execuções simultâneas
+        (SCRAPER_EXTRACTOR_CONCURRENCY). O ``max_concurrency`` do Source.config
+        limita só o host da fonte: fontes no mesmo servidor dividem o menor
+        limite configurado entre elas, as demais não são afetadas. Fontes de
+        tipo sem extrator recebem um Future já com o erro.
+        """
+        default_limit = self.app.config.get('SCRAPER_EXTRACTOR_CONCURRENCY', 4)
+        jobs = []
+        failures: List[Tuple[Source, Future]] = []
+        host_limits: Dict[str, int] = {}
+        for source in sources:
+            try:
+                extractor = self.get_extractor(source)
+            except ValueError as e:
+                # Tipo sem extrator: falha como qualquer outra fonte (histórico,
+                # contagem de falhas e próxima coleta pelo caminho normal)
+                failed: Future = Future()
+                failed.set_exception(e)
+                failures.append((source, failed))
+                continue
+            # Cópia simples: as threads do pool não tocam nos objetos ORM
+            config = dict(source.config or {})
+            host = urlparse(source.url).netloc
+            host_limits[host] = min(host_limits.get(host, default_limit), config.get('max_concurrency') or default_limit)
+            jobs.append((source, extractor, type(extractor).__name__, host, source.url, config))
+        
+        type_semaphores = {name: threading.Semaphore(max(1, default_limit)) for _, _, name, _, _, _ in jobs}
+        host_semaphores = {host: threading.Semaphore(max(1, limit)) for host, limit in host_limits.items()}
+        return [
+            (source, self.pool.submit_io(partial(
+                self.run_extractor, extractor, url, config,
+                (host_semaphores[host], type_semaphores[name]), source.name
+            )))
+            for source, extractor, name, host, url, config in jobs
+        ] + failures
+
+    def run_extractor(self, extractor: ContentExtractor, url: str, config: Dict[str, Any],
+                      limits: Tuple[threading.Semaphore, ...],
+                      source_name: str = '') -> Tuple[List[Dict], Dict[str, Any]]:
+        """Entradas do extrator e o status/bytes da resposta (para o histórico)"""
+        with ExitStack() as stack:
+            # Sempre na mesma ordem (host, tipo): quem espera pelo host não
+            # segura uma vaga do tipo, e não há deadlock entre fontes
+            for limit in limits:
+                stack.enter_context(limit)
+            # Para fontes webpage/api, a execução do extrator é a etapa de download da fonte
+            with self.metrics.timer('feed_fetch', source_name or url):
+                entries = extractor.extract(url, config)
+            return entries, extractor.last_fetch()
+
+    def collect_feed_results(self, source: Source, futures: List[Future]) -> List[Dict[str, Any]]:
+        """Aguarda as entradas enviadas ao pool e retorna os editais montados"""
+        all_editais = []
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+                if result:
+                    all_editais.append(result)
+            except Exception as e:
+                self.logger.error(f"Erro ao processar entrada do feed: {str(e)}")
+        
+        self.logger.info(f"Concluído parse do feed {source.url}. Encontrados {len(all_editais)} editais.")
+        return all_editais
+
+    def log_stats(self):
+        fetched, skipped = self.stats['pages_fetched'], self.stats['pages_skipped']
+        total = fetched + skipped
+        if total:
+            self.logger.info(
+                f"Page fetches: {fetched} done, {skipped} avoided "
+                f"({skipped / total:.0%} of {total} new entries resolved from source metadata)"
+            )
+        summary = self.metrics.format_summary()
+        if summary:
+            self.logger.info(f"Tempo por etapa nesta execução:\n{summary}")
+
+    def register_poll(self, source: Source, new_entries: int):
+        """Agenda a próxima coleta da fonte conforme a frequência de novidades"""
+        source.register_poll(
+            new_entries,
+            min_interval=self.app.config.get('SCRAPER_MIN_POLL_MINUTES', 15),
+            max_interval=self.app.config.get('SCRAPER_MAX_POLL_MINUTES', 1440)
+        )
+
+    def parse_rss_feeds(self, due_only: bool = False) -> int:
+        """Parse os feeds RSS ativos e retorna o número de novos editais"""
+        return self.parse_sources(due_only=due_only, types=('rss',))
+
+    def parse_sources(self, due_only: bool = False, types: Optional[Tuple[str, ...]] = None) -> int:
+        """Coleta as fontes ativas de todos os tipos e retorna o número de novos editais
+
+        Feeds RSS são baixados juntos pelo AsyncFeedFetcher (GET condicional);
+        as demais fontes rodam seu extrator no pool, ao mesmo tempo. As
+        entradas de todas seguem o mesmo pipeline (relevância, página sob
+        demanda, deduplicação e inserção em lote). Com ``due_only`` apenas as
+        fontes cuja próxima coleta já venceu são coletadas; sem ele
+        (atualização manual) todas as fontes ativas são. Cada execução fica
+        registrada em scrape_runs, com o resultado de cada fonte em
+        scrape_source_results.
+
+        A sessão desta thread só lê: editais novos, estado das fontes e
+        histórico são gravados pela fila única de escrita (db_writer), que
+        junta as fontes prontas em poucos commits.
+        """
         try:
             with self.app.app_context():
-                # Obtém todas as fontes RSS ativas
-                sources = Source.query.filter_by(type='rss', active=True).all()
+                # Obtém todas as fontes ativas
+                query = Source.query.filter_by(active=True)
+                if types:
+                    query = query.filter(Source.type.in_(types))
+                if due_only:
+                    query = query.filter(or_(
+                        Source.next_poll_at.is_(None),
+                        Source.next_poll_at <= datetime.now()
+                    ))
+                sources = [source for source in query.all() if source.url]
                 
                 if not sources:
-                    self.logger.warning("No active RSS sources found")
+                    self.logger.info("No active sources due for polling")
                     return 0
                 
-                self.logger.info(f"Found {len(sources)} active RSS sources")
-                total_new = 0
+                self.logger.info(f"Found {len(sources)} active sources")
+                self.stats.clear()
+                self.metrics.clear()
+                self.results.clear()
+                self.run_id = db_writer.submit(partial(self.create_run, len(sources))).result()
+                saved = []
+                
+                # Os extratores começam primeiro e rodam enquanto os feeds são baixados
+                extraction_sources = [s for s in sources if s.type != 'rss']
+                for source in extraction_sources:
+                    self.start_result(source)
+                extractions = self.submit_extractions(extraction_sources)
+                
+                # Baixa todos os feeds em paralelo antes de processar as entradas
+                feeds = [source for source in sources if source.type == 'rss']
+                started = time.monotonic()
+                fetch_results = self.fetcher.fetch_all(feeds)
+                self.logger.info(f"Fetched {len(fetch_results)} feeds in {time.monotonic() - started:.1f}s")
+                
+                # Envia as entradas de todas as fontes para o pool antes de
+                # esperar por qualquer uma, para não serializar as fontes
+                pending = []
+                for fetch_result in fetch_results:
+                    source = fetch_result['source']
+                    self.metrics.observe('feed_fetch', source.name, fetch_result['elapsed'])
+                    self.start_result(source, fetch_result['started_at'],
+                                      http_status=fetch_result['status'], bytes=fetch_result['bytes'])
+                    if fetch_result['error']:
+                        self.metrics.inc('feed_errors', source.name)
+                        # Fontes com erro também espaçam as tentativas
+                        saved.append((source, self.save_source(source, error=fetch_result['error'])))
+                        continue
+                    if fetch_result['not_modified']:
+                        # Feed inalterado desde o último scrape: nada para processar
+                        self.logger.info(f"Feed not modified: {source.url}")
+                        self.metrics.inc('feeds_not_modified', source.name)
+                        self.results[source.id]['not_modified'] = True
+                        saved.append((source, self.save_source(source, last_scrape=datetime.now())))
+                        continue
+                    state = {'etag': fetch_result['etag'], 'last_modified': fetch_result['last_modified']}
+                    pending.append((source, state, self.submit_feed_content(source, fetch_result['content'])))
                 
-                # Processa cada fonte
-                for source in sources:
+                for source, future in extractions:
                     try:
-                        editais = self.parse_rss_feed(source)
-                        
-                        # Filtra editais já existentes
-                        new_editais = []
-                        for edital in editais:
-                            exists = Edital.query.filter_by(
-                                link=edital['link']
-                            ).first() is not None
-                            
-                            if not exists:
-                                new_editais.append(edital)
-                        
-                        # Adiciona novos editais ao banco
-                        for edital in new_editais:
-                            try:
-                                new_edital = Edital(**edital)
-                                db.session.add(new_edital)
-                            except Exception as e:
-                                self.logger.error(f"Error adding edital: {str(e)}")
-                                continue
+                        entries, fetched = future.result()
+                        self.results[source.id].update(fetched)
+                    except Exception as e:
+                        # HTTPError (raise_for_status) traz a resposta com o status
+                        response = getattr(e, 'response', None)
+                        if response is not None:
+                            self.results[source.id].update(http_status=response.status_code,
+                                                           bytes=len(response.content))
+                        self.logger.error(f"Erro ao processar fonte {source.name}: {str(e)}")
+                        self.metrics.inc('feed_errors', source.name)
+                        saved.append((source, self.save_source(source, error=str(e))))
+                        continue
+                    pending.append((source, {}, self.submit_extracted_entries(source, entries)))
+                
+                # Processa cada fonte conforme suas entradas ficam prontas
+                for source, state, futures in pending:
+                    try:
+                        editais = self.collect_feed_results(source, futures)
                         
-                        # Atualiza timestamp do último scrape
-                        source.last_scrape = datetime.now()
+                        # Filtra editais já existentes com uma única consulta
+                        with self.metrics.timer('dedup', source.name):
+                            known_links = self.load_known_links([e['link'] for e in editais])
+                            new_editais = [e for e in editais if e['link'] not in known_links]
                         
-                        # Commit das mudanças
-                        try:
-                            db.session.commit()
-                            total_new += len(new_editais)
-                            self.logger.info(f"Added {len(new_editais)} new editais from {source.name}")
-                        except Exception as e:
-                            self.logger.error(f"Error committing changes: {str(e)}")
-                            db.session.rollback()
-                    
+                        # Insere os novos editais em lote, atualiza o último scrape e agenda a próxima coleta
+                        saved.append((source, self.save_source(
+                            source, new_editais, last_scrape=datetime.now(), **state
+                        )))
                     except Exception as e:
                         self.logger.error(f"Error processing source {source.name}: {str(e)}")
-                        db.session.rollback()
+                        saved.append((source, self.save_source(source, error=str(e))))
+                
+                total_new = 0
+                for source, future in saved:
+                    try:
+                        inserted = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error committing changes for {source.name}: {str(e)}")
+                        self.record_failure(source, e)
                         continue
+                    self.metrics.inc('editais_inserted', source.name, inserted)
+                    total_new += inserted
+                    self.logger.info(f"Added {inserted} new editais from {source.name}")
+                if total_new:
+                    # Invalida as respostas em cache de /api/editais e /api/categorias
+                    self.bump_response_cache()
                 
+                self.finish_run(total_new)
+                self.log_stats()
                 return total_new
                 
         except Exception as e:
-            self.logger.error(f"Error in parse_rss_feeds: {str(e)}")
+            self.logger.error(f"Error in parse_sources: {str(e)}")
+            self.fail_run(e)
             return 0
 
+    def start_result(self, source: Source, started_at: Optional[datetime] = None, **fields):
+        """Começa o registro do resultado da fonte nesta execução"""
+        self.results[source.id] = {
+            'started_at': started_at or datetime.now(),
+            'http_status': None,
+            'bytes': None,
+            'not_modified': False,
+            'entries_seen': 0,
+            'entries_relevant': 0,
+            'new_editais': 0,
+            'error': None,
+            **fields
+        }
+
+    def count_entries(self, source: Source, field: str, amount: int = 1):
+        result = self.results.get(source.id)
+        if result is not None:
+            result[field] += amount
+
+    def save_source(self, source: Source, editais: Optional[List[Dict[str, Any]]] = None,
+                    error: Optional[str] = None, **state) -> Future:
+        """Envia para a fila de escrita os editais novos da fonte, o estado dela
+        (``state``: last_scrape, etag...) e o resultado nesta execução
+
+        O Future devolve quantos editais foram inseridos.
+        """
+        # Só valores simples: a thread de escrita não toca nos objetos desta sessão
+        source_id, source_name = source.id, source.name
+        rows = list(editais or [])
+        result = dict(self.results.get(source_id) or {})
+        run_id = self.run_id
+        
+        def write(session):
+            commit_started = time.perf_counter()
+            inserted = self.insert_editais(rows, session) if rows else 0
+            current = session.get(Source, source_id)
+            if current is not None:
+                for column, value in state.items():
+                    setattr(current, column, value)
+                self.register_poll(current, inserted)
+                self.count_failure(current, error)
+            if result and run_id:
+                session.add(ScrapeSourceResult(
+                    run_id=run_id,
+                    source_id=source_id,
+                    source_name=source_name,
+                    finished_at=datetime.now(),
+                    **dict(result, new_editais=inserted, error=error[:1000] if error else None)
+                ))
+            self.metrics.observe('commit', source_name, time.perf_counter() - commit_started)
+            return inserted
+        
+        return db_writer.submit(write)
+
+    def count_failure(self, source: Source, error: Optional[str]):
+        """Atualiza o contador de falhas seguidas da fonte
+
+        Depois de SCRAPER_MAX_FAILURES coletas seguidas com erro a fonte é
+        desativada; 0 desliga a desativação automática.
+        """
+        if not error:
+            source.consecutive_failures = 0
+            return
+        source.consecutive_failures = (source.consecutive_failures or 0) + 1
+        max_failures = self.app.config.get('SCRAPER_MAX_FAILURES', 10)
+        if max_failures and source.consecutive_failures >= max_failures and source.active:
+            source.active = False
+            self.logger.warning(
+                f"Source {source.name} deactivated after {source.consecutive_failures} consecutive failures"
+            )
+
+    def record_failure(self, source: Source, error: Exception):
+        """Registra a falha de uma fonte cuja gravação não deu certo"""
+        try:
+            self.save_source(source, error=str(error)).result()
+        except Exception as e:
+            self.logger.error(f"Error saving scrape result for {source.name}: {str(e)}")
+
+    @staticmethod
+    def create_run(sources_count: int, session) -> int:
+        run = ScrapeRun(started_at=datetime.now(), sources_count=sources_count)
+        session.add(run)
+        session.flush()
+        return run.id
+
+    def finish_run(self, total_new: int):
+        """Fecha a execução e apaga o histórico mais antigo que SCRAPER_HISTORY_DAYS"""
+        run_id = self.run_id
+        cutoff = datetime.now() - timedelta(days=self.app.config.get('SCRAPER_HISTORY_DAYS', 30))
+        
+        def write(session):
+            failed = session.query(ScrapeSourceResult).filter(
+                ScrapeSourceResult.run_id == run_id,
+                ScrapeSourceResult.error.isnot(None)
+            ).count()
+            session.execute(update_stmt(ScrapeRun).where(ScrapeRun.id == run_id).values(
+                finished_at=datetime.now(), status='completed',
+                new_editais=total_new, failed_sources=failed
+            ))
+            old_runs = select(ScrapeRun.id).where(ScrapeRun.started_at < cutoff).scalar_subquery()
+            session.execute(delete(ScrapeSourceResult).where(ScrapeSourceResult.run_id.in_(old_runs)))
+            session.execute(delete(ScrapeRun).where(ScrapeRun.started_at < cutoff))
+        
+        try:
+            db_writer.submit(write).result()
+        except Exception as e:
+            self.logger.error(f"Error saving scrape run: {str(e)}")
+
+    def fail_run(self, error: Exception):
+        """Marca a execução como falha quando parse_sources é interrompido"""
+        run_id = self.run_id
+        if run_id is None:
+            return
+        
+        def write(session):
+            session.execute(update_stmt(ScrapeRun).where(ScrapeRun.id == run_id).values(
+                status='failed', finished_at=datetime.now(), error=str(error)[:1000]
+            ))
+        
+        try:
+            db_writer.submit(write).result()
+        except Exception as e:
+            self.logger.error(f"Error saving scrape run: {str(e)}")
+
+    def bump_response_cache(self):
+        """Incrementa a geração do cache de respostas pela fila de escrita"""
+        try:
+            db_writer.submit(response_cache.increment).result()
+        except Exception as e:
+            self.logger.error(f"Error invalidating response cache: {str(e)}")
+            return
+        response_cache.refresh()
+
+    def recheck_editais(self, limit: Optional[int] = None) -> int:
+        """Reverifica as páginas dos editais ainda abertos e atualiza os que mudaram
+
+        Cada página é pedida com GET condicional (ETag/Last-Modified); se o
+        servidor responder 200, o texto extraído é comparado pelo hash e só as
+        linhas cujo conteúdo mudou têm prazo, categoria e descrição refeitos.
+        Retorna o número de editais atualizados.
+        """
+        limit = limit or self.app.config.get('SCRAPER_RECHECK_BATCH', 100)
+        interval = timedelta(hours=self.app.config.get('SCRAPER_RECHECK_HOURS', 24))
+        now = datetime.utcnow()
+        with self.app.app_context():
+            # Sem checked_at (cadastrados antes da reverificação) vêm primeiro na ordenação do SQLite
+            editais = Edital.query.filter(
+                Edital.data_vencimento >= datetime.now(),
+                or_(Edital.checked_at.is_(None), Edital.checked_at < now - interval)
+            ).order_by(Edital.checked_at).limit(limit).all()
+            if not editais:
+                return 0
+            
+            # Os workers recebem cópias simples, nunca objetos da sessão
+            futures = []
+            for edital in editais:
+                snapshot = {
+                    'id': edital.id,
+                    'link': edital.link,
+                    'content_hash': edital.content_hash,
+                    'data_vencimento': edital.data_vencimento,
+                    'categoria': edital.categoria,
+                }
+                futures.append(self.pool.submit(
+                    partial(self.fetch_page_result, edital.link, edital.page_etag, edital.page_last_modified),
+                    partial(self.check_page, snapshot)
+                ))
+            
+            updates = []
+            outcomes = Counter()
+            for future in as_completed(futures):
+                try:
+                    update, outcome = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error rechecking edital page: {str(e)}")
+                    continue
+                updates.append(update)
+                outcomes[outcome] += 1
+            
+            try:
+                # UPDATE em lote pela chave primária, pela fila de escrita
+                db_writer.submit(lambda session: session.execute(update_stmt(Edital), updates)).result()
+            except Exception as e:
+                self.logger.error(f"Error saving rechecked editais: {str(e)}")
+                return 0
+            
+            if outcomes['updated']:
+                self.bump_response_cache()
+            self.logger.info(
+                f"Rechecked {len(updates)} pages: {outcomes['not_modified']} not modified, "
+                f"{outcomes['unchanged']} unchanged, {outcomes['baseline']} first hash, "
+                f"{outcomes['updated']} updated, {outcomes['failed']} failed"
+            )
+            return outcomes['updated']
+
+    def check_page(self, snapshot: Dict[str, Any], fetched: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """Compara a página baixada com o edital salvo (etapa de parse da reverificação)"""
+        update = {
+            'id': snapshot['id'],
+            'checked_at': datetime.utcnow(),
+            'page_etag': fetched['etag'],
+            'page_last_modified': fetched['last_modified'],
+        }
+        if fetched['not_modified']:
+            return update, 'not_modified'
+        
+        content, page_date = self.parse_page(fetched['html'], snapshot['link'])
+        if not content:
+            return update, 'failed'
+        
+        update['content_hash'] = self.hash_content(content)
+        if update['content_hash'] == snapshot['content_hash']:
+            return update, 'unchanged'
+        if snapshot['content_hash'] is None:
+            # Edital montado só com o feed: a primeira leitura serve de referência
+            return update, 'baseline'
+        
+        update['data_vencimento'] = page_date or self.extract_date(content) or snapshot['data_vencimento']
+        categoria = self.extract_categoria(content)
+        if keywords.is_thematic(categoria) or not keywords.is_thematic(snapshot['categoria']):
+            update['categoria'] = categoria
+        update['descricao'] = content if len(content) <= 500 else content[:497] + "..."
+        self.logger.info(f"Content changed: {snapshot['link']}")
+        return update, 'updated'
+
     def extract_categoria(self, text: str) -> Optional[str]:
         """Extrai categoria do texto baseado em palavras-chave"""
         if not text:
             return None
-            
-        text = text.lower()
-        
-        categorias = {
-            'Música': ['música', 'musical', 'músico', 'musicista', 'concerto', 'show'],
-            'Teatro': ['teatro', 'teatral', 'dramaturgia', 'cênico', 'espetáculo'],
-            'Dança': ['dança', 'bailarino', 'coreografia'],
-            'Cinema': ['cinema', 'audiovisual', 'filme', 'curta-metragem'],
-            'Literatura': ['literatura', 'livro', 'escritor', 'poesia', 'conto'],
-            'Artes Visuais': ['artes visuais', 'exposição', 'galeria', 'artista plástico'],
-            'Patrimônio': ['patrimônio', 'histórico', 'cultural', 'preservação'],
-            'Fomento': ['fomento', 'incentivo', 'financiamento', 'patrocínio'],
-            'Formação': ['formação', 'workshop', 'oficina', 'curso', 'capacitação'],
-        }
-        
-        for categoria, keywords in categorias.items():
-            if any(keyword in text for keyword in keywords):
-                return categoria
-                
-        if 'edital' in text:
-            return 'Edital'
-        elif 'prêmio' in text:
-            return 'Prêmio'
-        elif 'concurso' in text:
-            return 'Concurso'
-            
-        return 'Outros'
+        return keywords.categoria(keywords.scan(text))
@@ -0,0 +1,73 @@
+import re
+from typing import Optional
+
+from sqlalchemy import func, literal_column, select, table, column, text
+
+from . import db
+
+# Índice FTS5 de conteúdo externo: o texto fica só em editais e o índice
+# é mantido pelos triggers abaixo. remove_diacritics faz "musica" casar com "música".
+FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS editais_fts USING fts5(
+        nome,
+        descricao,
+        content='editais',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS editais_fts_ai AFTER INSERT ON editais BEGIN
+        INSERT INTO editais_fts(rowid, nome, descricao)
+        VALUES (new.id, new.nome, new.descricao);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS editais_fts_ad AFTER DELETE ON editais BEGIN
+        INSERT INTO editais_fts(editais_fts, rowid, nome, descricao)
+        VALUES ('delete', old.id, old.nome, old.descricao);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS editais_fts_au AFTER UPDATE OF nome, descricao ON editais BEGIN
+        INSERT INTO editais_fts(editais_fts, rowid, nome, descricao)
+        VALUES ('delete', old.id, old.nome, old.descricao);
+        INSERT INTO editais_fts(rowid, nome, descricao)
+        VALUES (new.id, new.nome, new.descricao);
+    END
+    """,
+]
+
+# Pesos do bm25 por coluna: casar no nome vale mais que na descrição
+BM25_WEIGHTS = (10.0, 1.0)
+
+editais_fts = table('editais_fts', column('rowid'))
+
+def setup_fts():
+    """Cria o índice FTS5 e os triggers, reconstruindo o índice se estiver defasado"""
+    with db.engine.begin() as conn:
+        for statement in FTS_DDL:
+            conn.execute(text(statement))
+        # editais_fts lê o texto de editais; o total indexado fica em editais_fts_docsize
+        total_editais = conn.execute(text('SELECT COUNT(*) FROM editais')).scalar()
+        total_indexed = conn.execute(text('SELECT COUNT(*) FROM editais_fts_docsize')).scalar()
+        if total_editais != total_indexed:
+            conn.execute(text("INSERT INTO editais_fts(editais_fts) VALUES ('rebuild')"))
+
+def build_match_query(search: str) -> Optional[str]:
+    """Converte o texto digitado em uma consulta FTS5 com prefixo em cada termo"""
+    terms = re.findall(r'\w+', search or '')
+    if not terms:
+        return None
+    # Aspas evitam que termos como AND/OR/NEAR sejam lidos como operadores
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_subquery(match_query: str):
+    """Subconsulta (edital_id, rank) com os editais que casam com a busca"""
+    return select(
+        editais_fts.c.rowid.label('edital_id'),
+        func.bm25(literal_column('editais_fts'), *BM25_WEIGHTS).label('rank')
+    ).where(
+        literal_column('editais_fts').op('MATCH')(match_query)
+    ).subquery('busca')
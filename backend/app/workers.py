@@ -0,0 +1,76 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+class ScrapePool:
+    """Pool de threads de longa duração compartilhado por todas as coletas.
+
+    Cada entrada do feed passa por duas etapas com filas próprias: download
+    (limitado pela rede, muitas threads) e parse (limitado pela CPU, poucas
+    threads). Não há barreira entre lotes: assim que uma página termina de
+    baixar ela entra na fila de parse e a thread de download pega a próxima.
+    """
+
+    def __init__(self, fetch_workers: int = 16, parse_workers: Optional[int] = None):
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 4
+        self._fetch_executor: Optional[ThreadPoolExecutor] = None
+        self._parse_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.fetch_workers = app.config.setdefault('SCRAPER_FETCH_WORKERS', self.fetch_workers)
+        self.parse_workers = app.config.setdefault('SCRAPER_PARSE_WORKERS', self.parse_workers)
+
+    def _executors(self):
+        # Criados sob demanda para que init_app possa ajustar os tamanhos antes
+        with self._lock:
+            if self._fetch_executor is None:
+                self._fetch_executor = ThreadPoolExecutor(
+                    max_workers=self.fetch_workers, thread_name_prefix='scrape-fetch'
+                )
+                self._parse_executor = ThreadPoolExecutor(
+                    max_workers=self.parse_workers, thread_name_prefix='scrape-parse'
+                )
+            return self._fetch_executor, self._parse_executor
+
+    def submit(self, fetch: Callable[[], Any], parse: Callable[[Any], Any]) -> Future:
+        """Agenda fetch() na fila de download e parse(resultado) na fila de parse"""
+        fetch_executor, parse_executor = self._executors()
+        result: Future = Future()
+
+        def on_parsed(parse_future: Future):
+            error = parse_future.exception()
+            if error:
+                result.set_exception(error)
+            else:
+                result.set_result(parse_future.result())
+
+        def on_fetched(fetch_future: Future):
+            error = fetch_future.exception()
+            if error:
+                result.set_exception(error)
+                return
+            try:
+                parse_executor.submit(parse, fetch_future.result()).add_done_callback(on_parsed)
+            except RuntimeError as e:  # pool encerrado
+                result.set_exception(e)
+
+        fetch_executor.submit(fetch).add_done_callback(on_fetched)
+        return result
+
+    def submit_io(self, fn: Callable[[], Any]) -> Future:
+        """Agenda só uma etapa de rede (ex.: extratores de fontes) na fila de download"""
+        fetch_executor, _ = self._executors()
+        return fetch_executor.submit(fn)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for executor in (self._fetch_executor, self._parse_executor):
+                if executor:
+                    executor.shutdown(wait=wait)
+            self._fetch_executor = None
+            self._parse_executor = None
+
+scrape_pool = ScrapePool()
@@ -0,0 +1,108 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from . import db
+
+Job = Tuple[Callable[[Any], Any], Future]
+
+class DbWriter:
+    """Fila única de escrita no banco para o scraper.
+
+    Os jobs são funções ``fn(session)`` executadas, na ordem em que chegam,
+    por uma única thread com sessão própria. Os jobs que chegam juntos (até
+    ``max_batch``, esperando no máximo ``max_delay`` segundos por mais) são
+    gravados em um único commit, então o SQLite tem sempre no máximo um
+    escritor do scraper e poucas transações curtas, e as leituras da API
+    (WAL) não ficam esperando. Se um job do lote falhar, o lote é desfeito e
+    cada job roda de novo sozinho, para que só o culpado receba o erro; por
+    isso os jobs não devem ter efeitos fora do banco.
+    """
+
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.05):
+        self.logger = logging.getLogger(__name__)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.app = None
+        self._queue: 'queue.Queue[Optional[Job]]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.max_batch = app.config.setdefault('DB_WRITER_BATCH', self.max_batch)
+        self.max_delay = app.config.setdefault('DB_WRITER_DELAY_MS', self.max_delay * 1000) / 1000
+
+    def submit(self, fn: Callable[[Any], Any]) -> Future:
+        """Agenda fn(session); o Future termina depois do commit do lote"""
+        if self.app is None:
+            raise RuntimeError('DbWriter.init_app não foi chamado')
+        future: Future = Future()
+        self._ensure_thread()
+        self._queue.put((fn, future))
+        return future
+
+    def _ensure_thread(self):
+        # Criada sob demanda, como os executores do ScrapePool
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._write(batch)
+                    return
+                batch.append(job)
+            self._write(batch)
+
+    def _write(self, batch: List[Job]):
+        try:
+            self._write_batch(batch)
+        except Exception as e:
+            # Nunca deixa quem espera pelo Future travado
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _write_batch(self, batch: List[Job]):
+        with self.app.app_context():
+            try:
+                results = [fn(db.session) for fn, _ in batch]
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    return
+                # Descobre o job com problema gravando um por um
+                for job in batch:
+                    self._write([job])
+                return
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True):
+        """Grava o que estiver na fila e encerra a thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            if wait:
+                thread.join()
+
+db_writer = DbWriter()
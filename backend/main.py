@@ -2,38 +2,31 @@ import urllib3
 urllib3.disable_warnings()
 
 from app import create_app, db
-from app.scraper import EditalScraper
-from apscheduler.schedulers.background import BackgroundScheduler
+from app.cache import response_cache
+from app.models import Edital
 from flask import jsonify
 from flask_cors import CORS
 from flask_migrate import Migrate
 
-app = create_app()
+# Debug (e o reloader) só quando executado diretamente
+app = create_app({'DEBUG': __name__ == '__main__'})
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 migrate = Migrate(app, db)
 
-def create_scraper():
-    """Cria uma instância do scraper com o contexto da aplicação"""
-    return EditalScraper(app)
-
-scraper = create_scraper()
-
 def scheduled_job():
-    """Function to run scheduled scraping"""
-    with app.app_context():
-        try:
-            num_new = scraper.parse_rss_feeds()
-            app.logger.info(f"Scheduled scraping completed. Added {num_new} new editais.")
-            return num_new
-        except Exception as e:
-            app.logger.error(f"Error in scheduled scraping: {str(e)}")
-            return 0
+    """Executa um ciclo do scraper pelo agendador da aplicação, coletando todas as fontes"""
+    return app.extensions['scrape_scheduler'].run_once(due_only=False)
 
 @app.route('/api/update-feeds', methods=['POST'])
 def update_feeds():
     """Endpoint to manually trigger RSS feed updates"""
     try:
         num_new = scheduled_job()
+        if num_new is None:
+            return jsonify({
+                'success': False,
+                'message': 'Atualização já em andamento, tente novamente em instantes.'
+            }), 409
         return jsonify({
             'success': True,
             'message': f'Feed update completed. Added {num_new} new editais.'
@@ -53,6 +46,7 @@ def clear_cache():
             # Delete all records from the editais table
             num_deleted = Edital.query.delete()
             db.session.commit()
+            response_cache.bump()
             return jsonify({
                 'success': True,
                 'message': f'Cache limpo com sucesso. {num_deleted} editais foram removidos.'
@@ -65,18 +59,6 @@ def clear_cache():
             'message': f'Erro ao limpar cache: {str(e)}'
         }), 500
 
-# Set up scheduler for periodic RSS feed checks
-scheduler = BackgroundScheduler()
-scheduler.add_job(scheduled_job, 'interval', hours=6)
-scheduler.start()
-
 if __name__ == '__main__':
-    # Initial feed parse
-    with app.app_context():
-        try:
-            scraper.parse_rss_feeds()
-        except Exception as e:
-            app.logger.error(f"Error in initial feed parse: {str(e)}")
-    
-    # Start the Flask application
-    app.run(debug=True, port=5000)
+    # Start the Flask application (o agendador roda a primeira coleta em background)
+    app.run(port=5000)
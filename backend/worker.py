@@ -0,0 +1,18 @@
+"""Processo dedicado ao scraper, separado do servidor web.
+
+Uso:
+    SCRAPER_MODE=worker flask run      # servidor web sem agendador
+    python worker.py                   # scraper em outro processo
+"""
+import urllib3
+urllib3.disable_warnings()
+
+import logging
+
+from app import create_app
+
+app = create_app({'SCRAPER_MODE': 'off'})
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    app.extensions['scrape_scheduler'].run_forever()
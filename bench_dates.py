@@ -0,0 +1,122 @@
+"""Micro-benchmark da extração de datas (app.dates) contra a versão anterior.
+
+Uso:
+    python bench_dates.py [caminho/do/banco.db] [--repeat N]
+
+O corpus são as descrições dos editais já gravados no banco; se o banco não
+existir ou estiver vazio, usa textos de exemplo embutidos. Além do tempo,
+mostra em quantos textos as duas versões escolheram datas diferentes (a nova
+prefere datas precedidas de "prazo", "até", "encerramento"...).
+"""
+import argparse
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+from backend.app.dates import extract_date
+
+DEFAULT_DB = Path(__file__).resolve().parent / 'backend' / 'cultura_alerta.db'
+
+SAMPLE_TEXTS = [
+    'Publicado em 01/10/2025. O Ministério da Cultura abre inscrições para o edital de '
+    'música até 15/12/2025. O resultado sai em 20/01/2026.',
+    'Edital Funarte de Teatro 2025 — prazo: 30 de novembro de 2025. Propostas enviadas '
+    'após o encerramento não serão avaliadas.',
+    'Chamada pública para festivais de dança. Período de inscrição de 05/09/2025 a '
+    '05/10/2025. Encerramento: 05/10/2025.',
+    'A Secretaria de Cultura divulgou nesta segunda-feira o resultado preliminar da '
+    'seleção de projetos audiovisuais. Recursos podem ser enviados em até cinco dias.',
+    'Oficinas gratuitas de artes visuais acontecem no dia 12 de agosto de 2025, no '
+    'centro cultural. Vencimento das inscrições: 01-08-2025.',
+]
+
+# Páginas completas costumam ter milhares de caracteres e, muitas vezes, nenhuma data útil
+ARTICLE_TEXT = (
+    'A programação cultural da cidade recebe neste fim de semana apresentações de '
+    'música, teatro e dança em diversos espaços públicos, com entrada gratuita. '
+) * 40
+
+SAMPLE_TEXTS = (SAMPLE_TEXTS + [ARTICLE_TEXT, ARTICLE_TEXT + SAMPLE_TEXTS[0]]) * 30
+
+def legacy_extract_date(text):
+    """Cópia da implementação anterior de EditalScraper.extract_date"""
+    if not text:
+        return None
+    date_patterns = [
+        r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',
+        r'(\d{1,2})\s+de\s+([^\s]+)\s+de\s+(\d{2,4})',
+        r'até\s+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',
+        r'prazo[:\s]+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',
+        r'encerramento[:\s]+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',
+        r'vencimento[:\s]+(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2,4})',
+    ]
+    month_names = {
+        'janeiro': 1, 'fevereiro': 2, 'março': 3, 'abril': 4,
+        'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
+        'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+        'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+        'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12
+    }
+    text = text.lower()
+    for pattern in date_patterns:
+        for match in re.finditer(pattern, text):
+            try:
+                day, month, year = match.groups()
+                if month.isalpha():
+                    if month not in month_names:
+                        continue
+                    month = month_names[month]
+                day, month, year = int(day), int(month), int(year)
+                if year < 100:
+                    year += 2000 if year < 50 else 1900
+                try:
+                    date = datetime(year, month, day)
+                    if 2020 <= date.year <= 2030:
+                        return date
+                except ValueError:
+                    continue
+            except (ValueError, AttributeError):
+                continue
+    return None
+
+def load_corpus(db_path: Path):
+    if db_path.exists():
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute('SELECT descricao FROM editais WHERE descricao IS NOT NULL').fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            conn.close()
+        if rows:
+            return [row[0] for row in rows], f'{db_path} ({len(rows)} editais)'
+    return SAMPLE_TEXTS, f'textos de exemplo ({len(SAMPLE_TEXTS)})'
+
+def bench(func, corpus, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in corpus:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(corpus)) * 1e6
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('db', nargs='?', type=Path, default=DEFAULT_DB)
+    arg_parser.add_argument('--repeat', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    corpus, label = load_corpus(args.db)
+    print(f"Corpus: {label}")
+
+    legacy = bench(legacy_extract_date, corpus, args.repeat)
+    current = bench(extract_date, corpus, args.repeat)
+    print(f"{'versão anterior':<18} {legacy:>8.1f} µs/texto")
+    print(f"{'app.dates':<18} {current:>8.1f} µs/texto  ({legacy / current:.1f}x)")
+
+    changed = sum(1 for text in corpus if legacy_extract_date(text) != extract_date(text))
+    print(f"Datas diferentes: {changed} de {len(corpus)} textos")
+
+if __name__ == '__main__':
+    main()
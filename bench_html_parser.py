@@ -0,0 +1,84 @@
+"""Compara o custo de parse_page com cada parser HTML disponível.
+
+Uso:
+    python bench_html_parser.py [pagina1.html pagina2.html ...] [--repeat N]
+
+Sem argumentos usa páginas sintéticas no formato das notícias do gov.br
+(Plone: cabeçalho e menus grandes, scripts inline, rodapé e o corpo dentro
+de <article>). Para medir com páginas reais, salve alguns artigos com
+"Salvar como" ou curl e passe os arquivos na linha de comando.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from backend.app import html_parser
+from backend.app import scraper as scraper_module
+
+PARAGRAPH = (
+    '<p>O Ministério da Cultura publicou o edital de seleção pública para '
+    'projetos de música, teatro e dança. As inscrições vão até 15/12/2025 e '
+    'devem ser feitas pela plataforma <a href="/inscricao">Mapas Culturais</a>. '
+    'Poderão participar pessoas físicas e jurídicas com atuação comprovada.</p>'
+)
+
+SCRIPT = '<script type="text/javascript">' + 'var dataLayer = dataLayer || [];' * 200 + '</script>'
+STYLE = '<style>' + '.portal-header .menu-item a { color: #1351b4; }' * 150 + '</style>'
+MENU = '<ul>' + ''.join(f'<li><a href="/pt-br/menu/{i}">Item de menu {i}</a></li>' for i in range(300)) + '</ul>'
+
+def synthetic_page(paragraphs: int) -> str:
+    return (
+        '<!DOCTYPE html><html lang="pt-br"><head><meta charset="utf-8">'
+        '<title>Edital de seleção — Ministério da Cultura</title>'
+        '<meta property="article:published_time" content="2025-10-01T10:00:00-03:00">'
+        f'{STYLE}{SCRIPT}{SCRIPT}</head><body>'
+        f'<header id="portal-header">{MENU}</header><nav>{MENU}</nav>'
+        '<div id="main-content"><article><h1 class="documentFirstHeading">Edital de seleção</h1>'
+        '<span class="documentPublished"><time datetime="2025-10-01">01/10/2025</time></span>'
+        + PARAGRAPH * paragraphs +
+        f'</article></div><!-- rodapé --><footer>{MENU}</footer>{SCRIPT}</body></html>'
+    )
+
+def load_pages(paths):
+    if paths:
+        return [(Path(p).name, Path(p).read_text(encoding='utf-8', errors='replace')) for p in paths]
+    return [(f'sintetica-{n}p', synthetic_page(n)) for n in (5, 20, 80)]
+
+def available_parsers():
+    parsers = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        parsers.append('lxml')
+    except ImportError:
+        pass
+    return parsers
+
+def bench(scraper, page: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scraper.parse_page(page)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('pages', nargs='*')
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    scraper = scraper_module.EditalScraper()
+    pages = load_pages(args.pages)
+    original_make_soup = html_parser.make_soup
+
+    baseline = {}
+    print(f"{'página':<20} {'KB':>6}  {'parser':<12} {'ms/página':>10} {'speedup':>8}")
+    for name, page in pages:
+        for parser in available_parsers():
+            # parse_page usa o make_soup importado no módulo do scraper
+            scraper_module.make_soup = lambda markup, p=parser: original_make_soup(markup, p)
+            ms = bench(scraper, page, args.repeat)
+            baseline.setdefault(name, ms)
+            print(f"{name:<20} {len(page) // 1024:>6}  {parser:<12} {ms:>10.2f} {baseline[name] / ms:>7.1f}x")
+        scraper_module.make_soup = original_make_soup
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""Benchmark de um ciclo completo do scraper, sem acessar a internet.
+
+Uso:
+    python bench_scrape.py [--feeds 20] [--entries 30] [--latency 50] [--error-rate 0.0]
+                           [--recorded backend/http_cache.db] [--read-probe] [--output bench_scrape.json]
+
+Um servidor HTTP local (em outro processo, para não contar no CPU/memória
+medidos) serve feeds RSS e páginas de artigos e o EditalScraper coleta
+todos eles com parse_rss_feeds contra um banco SQLite temporário.
+
+Fixtures:
+  * padrão: feeds e páginas sintéticos no formato do gov.br; metade das
+    entradas traz o prazo no próprio feed (não precisa da página);
+  * --recorded: respostas gravadas pelo cache HTTP de uma coleta real
+    (backend/http_cache.db). Os links para os sites originais são
+    reescritos para o servidor local.
+
+São feitas duas execuções: "cold" (banco vazio: download, parse e inserção)
+e "warm" (tudo já cadastrado: exercita a deduplicação). O resultado vai
+para um JSON para comparar entre commits.
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import sqlite3
+import subprocess
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from bench_html_parser import synthetic_page
+
+# --- Fixtures -----------------------------------------------------------------
+
+def synthetic_fixtures(feeds: int, entries: int):
+    """Rotas {caminho: (content_type, corpo)} e caminhos dos feeds; corpos com {base}"""
+    routes = {}
+    deadline = (datetime.now() + timedelta(days=45)).strftime('%d/%m/%Y')
+    for f in range(feeds):
+        items = []
+        for e in range(entries):
+            # Metade com prazo no resumo (resolvida no nível 1), metade sem
+            summary = f'Inscrições até {deadline} para projetos de música.' if e % 2 else 'Seleção pública de projetos culturais.'
+            items.append(
+                f'<item><title>Edital de cultura {f}-{e}</title>'
+                f'<link>{{base}}/pages/{f}/{e}.html</link>'
+                f'<description>{summary}</description>'
+                f'<pubDate>Mon, 06 Oct 2025 10:00:00 -0300</pubDate></item>'
+            )
+            routes[f'/pages/{f}/{e}.html'] = ('text/html; charset=utf-8', synthetic_page(10 + e % 20))
+        routes[f'/feeds/{f}.xml'] = (
+            'application/rss+xml; charset=utf-8',
+            f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+            f'<title>Feed {f}</title>{"".join(items)}</channel></rss>'
+        )
+    return routes, [f'/feeds/{f}.xml' for f in range(feeds)]
+
+def recorded_fixtures(path: Path):
+    """Respostas gravadas no cache HTTP, servidas em /<host>/<caminho>"""
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute('SELECT url, headers, body FROM responses WHERE status = 200').fetchall()
+    finally:
+        conn.close()
+
+    hosts = {urlsplit(url).netloc for url, _, _ in rows}
+    routes, feeds = {}, []
+    for url, headers, body in rows:
+        parts = urlsplit(url)
+        local = f'/{parts.netloc}{parts.path}' + (f'?{parts.query}' if parts.query else '')
+        content_type = json.loads(headers).get('Content-Type', 'text/html')
+        text = body.decode('utf-8', errors='replace')
+        for host in hosts:
+            for scheme in ('https', 'http'):
+                text = text.replace(f'{scheme}://{host}', f'{{base}}/{host}')
+        routes[local] = (content_type, text)
+        if 'xml' in content_type or 'rss' in content_type or parts.path.rstrip('/').lower().endswith('rss'):
+            feeds.append(local)
+    return routes, feeds
+
+# --- Servidor -----------------------------------------------------------------
+
+def serve(routes, latency_ms, error_rate, ready, counters):
+    """Processo filho: serve as fixtures com latência e erros injetados"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with counters['requests'].get_lock():
+                counters['requests'].value += 1
+            if latency_ms:
+                time.sleep(latency_ms * random.uniform(0.5, 1.5) / 1000)
+            if random.random() < error_rate:
+                with counters['errors'].get_lock():
+                    counters['errors'].value += 1
+                return self._send(500, 'text/plain', b'erro injetado')
+            route = bodies.get(self.path)
+            if route is None:
+                return self._send(404, 'text/plain', b'not found')
+            self._send(200, *route)
+
+        def _send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    base = f'http://127.0.0.1:{server.server_port}'
+    bodies = {path: (ctype, body.replace('{base}', base).encode('utf-8')) for path, (ctype, body) in routes.items()}
+    ready.put(base)
+    server.serve_forever()
+
+# --- Benchmark ----------------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def probe_reads(app, stop: threading.Event, latencies: list):
+    """Leituras no formato de /api/editais enquanto o scraper grava"""
+    from backend.app.models import Edital
+
+    with app.app_context():
+        while not stop.is_set():
+            started = time.perf_counter()
+            Edital.query.order_by(Edital.data_publicacao.desc()).limit(20).all()
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+def read_summary(latencies: list):
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return {
+        'count': len(ordered),
+        'p50_ms': round(statistics.median(ordered), 2),
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+        'max_ms': round(ordered[-1], 2),
+    }
+
+def run_cycle(app, name, counters, feed_entries, read_probe=False):
+    from backend.app.models import Edital
+    from backend.app.scraper import EditalScraper
+
+    requests_before = counters['requests'].value
+    errors_before = counters['errors'].value
+    scraper = EditalScraper(app)
+    stop, latencies = threading.Event(), []
+    if read_probe:
+        reader = threading.Thread(target=probe_reads, args=(app, stop, latencies), daemon=True)
+        reader.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    new = scraper.parse_rss_feeds()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    stop.set()
+    requests_made = counters['requests'].value - requests_before
+    with app.app_context():
+        total = Edital.query.count()
+    return {
+        'name': name,
+        'wall_s': round(wall, 3),
+        'requests': requests_made,
+        'errors_injected': counters['errors'].value - errors_before,
+        'req_per_s': round(requests_made / wall, 1) if wall else None,
+        'feed_entries': feed_entries,
+        'new_editais': new,
+        'editais_total': total,
+        'cpu_s': round(cpu, 3),
+        'cpu_ms_per_entry': round(cpu * 1000 / feed_entries, 3) if feed_entries else None,
+        'pages_fetched': scraper.stats['pages_fetched'],
+        'pages_skipped': scraper.stats['pages_skipped'],
+        # Latência das leituras concorrentes com a coleta (--read-probe)
+        'reads': read_summary(latencies),
+        # Tempo por etapa e fonte (ScrapeMetrics), para ver onde a regressão está
+        'stages': [dict(row, total=round(row['total'], 4), mean=round(row['mean'], 5), max=round(row['max'], 5))
+                   for row in scraper.metrics.summary()],
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--feeds', type=int, default=20)
+    arg_parser.add_argument('--entries', type=int, default=30, help='entradas por feed')
+    arg_parser.add_argument('--latency', type=float, default=50, help='latência média por requisição (ms)')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='fração de respostas 500')
+    arg_parser.add_argument('--recorded', type=Path, help='cache HTTP gravado (backend/http_cache.db)')
+    arg_parser.add_argument('--read-probe', action='store_true',
+                            help='mede a latência de leituras do banco durante a coleta')
+    arg_parser.add_argument('--output', type=Path, default=Path('bench_scrape.json'))
+    args = arg_parser.parse_args()
+
+    if args.recorded:
+        routes, feed_paths = recorded_fixtures(args.recorded)
+    else:
+        routes, feed_paths = synthetic_fixtures(args.feeds, args.entries)
+    if not feed_paths:
+        sys.exit('Nenhum feed nas fixtures')
+    feed_entries = sum(routes[path][1].count('<item') + routes[path][1].count('<entry') for path in feed_paths)
+
+    ctx = multiprocessing.get_context('spawn')
+    counters = {'requests': ctx.Value('i', 0), 'errors': ctx.Value('i', 0)}
+    ready = ctx.Queue()
+    server = ctx.Process(target=serve, args=(routes, args.latency, args.error_rate, ready, counters), daemon=True)
+    server.start()
+    base = ready.get(timeout=30)
+
+    from backend.app import create_app, db
+    from backend.app.models import Source
+    from backend.app.workers import scrape_pool
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SCRAPER_MODE': 'off',
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp}/bench.db',
+            'HTTP_CACHE_ENABLED': False,
+            # Todas as fixtures estão no mesmo host local: sem espaçamento de cortesia
+            'HTTP_MIN_HOST_INTERVAL': 0,
+        })
+        with app.app_context():
+            for i, path in enumerate(feed_paths):
+                db.session.add(Source(name=f'bench-{i}', url=base + path, type='rss'))
+            db.session.commit()
+
+        runs = [run_cycle(app, 'cold', counters, feed_entries, args.read_probe),
+                run_cycle(app, 'warm', counters, feed_entries, args.read_probe)]
+        scrape_pool.shutdown()
+        with app.app_context():
+            db.engine.dispose()
+    server.terminate()
+
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'params': {
+            'fixtures': str(args.recorded) if args.recorded else 'synthetic',
+            'feeds': len(feed_paths),
+            'feed_entries': feed_entries,
+            'latency_ms': args.latency,
+            'error_rate': args.error_rate,
+        },
+        'runs': runs,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    args.output.write_text(json.dumps(result, indent=2))
+
+    print(f"{'execução':<8} {'tempo (s)':>9} {'reqs':>6} {'req/s':>7} {'novos':>6} {'CPU ms/entrada':>15} {'páginas':>8}")
+    for run in runs:
+        print(f"{run['name']:<8} {run['wall_s']:>9.2f} {run['requests']:>6} {run['req_per_s'] or 0:>7.1f} "
+              f"{run['new_editais']:>6} {run['cpu_ms_per_entry'] or 0:>15.2f} {run['pages_fetched']:>8}")
+    for run in runs:
+        if run['reads']:
+            print(f"leituras durante {run['name']}: p50 {run['reads']['p50_ms']} ms, "
+                  f"p99 {run['reads']['p99_ms']} ms, máx {run['reads']['max_ms']} ms")
+    print(f"Pico de memória: {result['peak_rss_mb']} MB -> {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 from backend.app import create_app
 from backend.app.models import Source
 
-app = create_app()
+app = create_app({'SCRAPER_MODE': 'off'})
 
 with app.app_context():
     sources = Source.query.filter_by(type='rss', active=True).all()
@@ -0,0 +1,57 @@
+"""Mostra o EXPLAIN QUERY PLAN das consultas de /api/editais.
+
+Uso:
+    python explain_queries.py [caminho/do/banco.db]
+
+Para cada combinação de filtros imprime o SQL gerado e o plano do SQLite,
+permitindo confirmar que os índices de editais estão sendo usados.
+"""
+import itertools
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.dialects import sqlite
+
+from backend.app.routes import build_editais_query
+
+DEFAULT_DB = Path(__file__).resolve().parent / 'backend' / 'cultura_alerta.db'
+
+# Valores de exemplo para cada filtro da listagem
+FILTERS = {
+    'categoria': 'Música',
+    'search': 'edital',
+    'data_inicio': datetime(2025, 1, 1),
+    'data_fim': datetime(2025, 12, 31),
+}
+
+def compile_query(query) -> str:
+    return str(query.compile(dialect=sqlite.dialect(), compile_kwargs={'literal_binds': True}))
+
+def explain(db_path: Path):
+    conn = sqlite3.connect(db_path)
+    try:
+        names = list(FILTERS)
+        for size in range(len(names) + 1):
+            for combo in itertools.combinations(names, size):
+                params = {name: FILTERS[name] for name in combo}
+                sql = compile_query(build_editais_query(**params))
+                print(f"== Filtros: {', '.join(combo) or '(nenhum)'}")
+                print(sql)
+                try:
+                    for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'):
+                        print(f'  {row[-1]}')
+                except sqlite3.OperationalError as e:
+                    # Ex.: banco sem a migração do índice FTS5
+                    print(f'  ERRO: {e}')
+                print()
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DB
+    if not db_path.exists():
+        print(f'Banco de dados não encontrado: {db_path}')
+        sys.exit(1)
+    explain(db_path)
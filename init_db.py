@@ -2,7 +2,7 @@ from backend.app import create_app, db
 from backend.app.models import Source, Edital
 
 def init_db():
-    app = create_app()
+    app = create_app({'SCRAPER_MODE': 'off'})
     with app.app_context():
         # Recria todas as tabelas
         db.drop_all()
@@ -0,0 +1,46 @@
+"""Adiciona índice de busca textual FTS5 para editais
+
+Revision ID: add_editais_fts
+"""
+from alembic import op
+
+def upgrade():
+    # Índice de conteúdo externo, sem acentos, sobre nome e descrição
+    op.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS editais_fts USING fts5(
+            nome,
+            descricao,
+            content='editais',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    # Triggers mantêm o índice em sincronia com a tabela editais
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS editais_fts_ai AFTER INSERT ON editais BEGIN
+            INSERT INTO editais_fts(rowid, nome, descricao)
+            VALUES (new.id, new.nome, new.descricao);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS editais_fts_ad AFTER DELETE ON editais BEGIN
+            INSERT INTO editais_fts(editais_fts, rowid, nome, descricao)
+            VALUES ('delete', old.id, old.nome, old.descricao);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS editais_fts_au AFTER UPDATE OF nome, descricao ON editais BEGIN
+            INSERT INTO editais_fts(editais_fts, rowid, nome, descricao)
+            VALUES ('delete', old.id, old.nome, old.descricao);
+            INSERT INTO editais_fts(rowid, nome, descricao)
+            VALUES (new.id, new.nome, new.descricao);
+        END
+    """)
+    # Indexa os editais já existentes
+    op.execute("INSERT INTO editais_fts(editais_fts) VALUES ('rebuild')")
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS editais_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS editais_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS editais_fts_ai')
+    op.execute('DROP TABLE IF EXISTS editais_fts')
@@ -0,0 +1,16 @@
+"""Adiciona índice único em editais.link
+
+Revision ID: add_editais_link_unique
+"""
+from alembic import op
+
+def upgrade():
+    # Remove duplicados antigos, mantendo o registro mais antigo de cada link
+    op.execute(
+        "DELETE FROM editais WHERE id NOT IN "
+        "(SELECT MIN(id) FROM editais GROUP BY link)"
+    )
+    op.create_index('ux_editais_link', 'editais', ['link'], unique=True)
+
+def downgrade():
+    op.drop_index('ux_editais_link', table_name='editais')
@@ -0,0 +1,22 @@
+"""Adiciona índices para os filtros de /api/editais
+
+Revision ID: add_editais_query_indexes
+"""
+from alembic import op
+
+def upgrade():
+    # Listagem sem filtros: ORDER BY data_publicacao DESC sem sort temporário
+    op.create_index('ix_editais_data_publicacao', 'editais', ['data_publicacao'])
+    # Filtro por categoria já ordenado por data de publicação
+    op.create_index('ix_editais_categoria_data_publicacao', 'editais', ['categoria', 'data_publicacao'])
+    # Intervalo de data de vencimento, com e sem categoria
+    op.create_index('ix_editais_data_vencimento', 'editais', ['data_vencimento'])
+    op.create_index('ix_editais_categoria_data_vencimento', 'editais', ['categoria', 'data_vencimento'])
+    # Atualiza as estatísticas usadas pelo planejador de consultas
+    op.execute('ANALYZE editais')
+
+def downgrade():
+    op.drop_index('ix_editais_categoria_data_vencimento', table_name='editais')
+    op.drop_index('ix_editais_data_vencimento', table_name='editais')
+    op.drop_index('ix_editais_categoria_data_publicacao', table_name='editais')
+    op.drop_index('ix_editais_data_publicacao', table_name='editais')
@@ -0,0 +1,21 @@
+"""Adiciona hash de conteúdo e validadores HTTP da página na tabela editais
+
+Revision ID: add_edital_change_detection
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    # Hash do texto normalizado da página e validadores para GET condicional
+    op.add_column('editais', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('editais', sa.Column('page_etag', sa.String(255), nullable=True))
+    op.add_column('editais', sa.Column('page_last_modified', sa.String(255), nullable=True))
+    op.add_column('editais', sa.Column('checked_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_editais_checked_at', 'editais', ['checked_at'])
+
+def downgrade():
+    op.drop_index('ix_editais_checked_at', table_name='editais')
+    op.drop_column('editais', 'checked_at')
+    op.drop_column('editais', 'page_last_modified')
+    op.drop_column('editais', 'page_etag')
+    op.drop_column('editais', 'content_hash')
@@ -0,0 +1,50 @@
+"""Adiciona o histórico de execuções do scraper e o contador de falhas das fontes
+
+Revision ID: add_scrape_history
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('sources', sa.Column('consecutive_failures', sa.Integer(), nullable=True, server_default='0'))
+    
+    op.create_table(
+        'scrape_runs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('sources_count', sa.Integer(), nullable=True),
+        sa.Column('failed_sources', sa.Integer(), nullable=True),
+        sa.Column('new_editais', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_scrape_runs_started_at', 'scrape_runs', ['started_at'])
+    
+    op.create_table(
+        'scrape_source_results',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('run_id', sa.Integer(), sa.ForeignKey('scrape_runs.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('source_id', sa.Integer(), sa.ForeignKey('sources.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('source_name', sa.String(100), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('http_status', sa.Integer(), nullable=True),
+        sa.Column('bytes', sa.Integer(), nullable=True),
+        sa.Column('not_modified', sa.Boolean(), nullable=True),
+        sa.Column('entries_seen', sa.Integer(), nullable=True),
+        sa.Column('entries_relevant', sa.Integer(), nullable=True),
+        sa.Column('new_editais', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_scrape_source_results_run_id', 'scrape_source_results', ['run_id'])
+    op.create_index('ix_scrape_source_results_source_started', 'scrape_source_results',
+                    ['source_id', 'started_at'])
+
+def downgrade():
+    op.drop_index('ix_scrape_source_results_source_started', table_name='scrape_source_results')
+    op.drop_index('ix_scrape_source_results_run_id', table_name='scrape_source_results')
+    op.drop_table('scrape_source_results')
+    op.drop_index('ix_scrape_runs_started_at', table_name='scrape_runs')
+    op.drop_table('scrape_runs')
+    op.drop_column('sources', 'consecutive_failures')
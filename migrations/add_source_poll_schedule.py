@@ -0,0 +1,19 @@
+"""Adiciona agenda adaptativa de coleta na tabela sources
+
+Revision ID: add_source_poll_schedule
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    # Intervalo atual (minutos), próxima coleta e histórico de novidades
+    op.add_column('sources', sa.Column('poll_interval', sa.Integer(), nullable=True))
+    op.add_column('sources', sa.Column('next_poll_at', sa.DateTime(), nullable=True))
+    op.add_column('sources', sa.Column('last_new_entry_at', sa.DateTime(), nullable=True))
+    op.add_column('sources', sa.Column('empty_polls', sa.Integer(), nullable=True, server_default='0'))
+
+def downgrade():
+    op.drop_column('sources', 'empty_polls')
+    op.drop_column('sources', 'last_new_entry_at')
+    op.drop_column('sources', 'next_poll_at')
+    op.drop_column('sources', 'poll_interval')
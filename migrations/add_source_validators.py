@@ -0,0 +1,15 @@
+"""Adiciona validadores HTTP (ETag / Last-Modified) na tabela sources
+
+Revision ID: add_source_validators
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    # Validadores usados no GET condicional dos feeds
+    op.add_column('sources', sa.Column('etag', sa.String(length=255), nullable=True))
+    op.add_column('sources', sa.Column('last_modified', sa.String(length=64), nullable=True))
+
+def downgrade():
+    op.drop_column('sources', 'last_modified')
+    op.drop_column('sources', 'etag')
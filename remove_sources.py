@@ -1,7 +1,7 @@
 from backend.app import create_app, db
 from backend.app.models import Source
 
-app = create_app()
+app = create_app({'SCRAPER_MODE': 'off'})
 
 with app.app_context():
     # Remove todas as fontes que não são as originais
@@ -4,10 +4,13 @@ import { FilterSection } from './components/FilterSection';
 import { EditalList } from './components/EditalList';
 import { EditalPreview } from './components/EditalPreview';
 import { SourceManager } from './components/SourceManager';
-import { Edital, EditalFilters } from './types';
+import { getEditaisPage, getEdital } from './services/api';
+import { Edital, EditalFilters, EditalResumo } from './types';
 
 const App: FC = () => {
-  const [editais, setEditais] = useState<Edital[]>([]);
+  const [editais, setEditais] = useState<EditalResumo[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedEdital, setSelectedEdital] = useState<Edital | null>(null);
   const [showSourceManager, setShowSourceManager] = useState(false);
   const [loading, setLoading] = useState(true);
@@ -23,29 +26,54 @@ const App: FC = () => {
     fetchEditais();
   }, [filters]);
 
+  const buildParams = () => {
+    const params: Record<string, string> = {};
+    if (filters.categoria) params.categoria = filters.categoria;
+    if (filters.search) params.search = filters.search;
+    if (filters.dataInicio) params.data_inicio = filters.dataInicio;
+    if (filters.dataFim) params.data_fim = filters.dataFim;
+    return params;
+  };
+
   const fetchEditais = async () => {
     try {
       setLoading(true);
-      const params = new URLSearchParams();
-      if (filters.categoria) params.append('categoria', filters.categoria);
-      if (filters.search) params.append('search', filters.search);
-      if (filters.dataInicio) params.append('data_inicio', filters.dataInicio);
-      if (filters.dataFim) params.append('data_fim', filters.dataFim);
-
-      const response = await fetch(`/api/editais?${params.toString()}`);
-      if (!response.ok) throw new Error('Falha ao carregar editais');
-      
-      const data = await response.json();
-      setEditais(data);
+      const page = await getEditaisPage(buildParams());
+      setEditais(page.items);
+      setNextCursor(page.nextCursor);
       setError(null);
-    } catch (err) {
-      setError(err instanceof Error ? err.message : 'Erro ao carregar editais');
+    } catch {
+      setError('Falha ao carregar editais');
       setEditais([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await getEditaisPage(buildParams(), nextCursor);
+      setEditais((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch {
+      setError('Falha ao carregar editais');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // A listagem traz só um resumo; o edital completo é buscado ao selecionar
+  const selectEdital = async (edital: EditalResumo) => {
+    try {
+      setSelectedEdital(await getEdital(edital.id));
+    } catch {
+      setError('Falha ao carregar edital');
+    }
+  };
+
   return (
     <div className="min-h-screen bg-gray-100">
       <Header />
@@ -72,8 +100,11 @@ const App: FC = () => {
                 <div className="lg:col-span-1">
                   <EditalList
                     editais={editais}
-                    selectedEdital={selectedEdital}
-                    onSelectEdital={setSelectedEdital}
+                    selectedId={selectedEdital?.id ?? null}
+                    onSelectEdital={selectEdital}
+                    hasMore={nextCursor !== null}
+                    loadingMore={loadingMore}
+                    onLoadMore={loadMore}
                   />
                 </div>
                 <div className="lg:col-span-2">
@@ -1,9 +1,9 @@
 import { type FC } from 'react';
 import { Calendar, Clock } from 'lucide-react';
-import { Edital } from '../types';
+import { EditalResumo } from '../types';
 
 interface EditalListItemProps {
-  edital: Edital;
+  edital: EditalResumo;
   isSelected: boolean;
   onClick: () => void;
 }
@@ -49,12 +49,22 @@ const EditalListItem: FC<EditalListItemProps> = ({ edital, isSelected, onClick }
 };
 
 interface EditalListProps {
-  editais: Edital[];
-  selectedEdital: Edital | null;
-  onSelectEdital: (edital: Edital) => void;
+  editais: EditalResumo[];
+  selectedId: number | null;
+  onSelectEdital: (edital: EditalResumo) => void;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
-export const EditalList: FC<EditalListProps> = ({ editais, selectedEdital, onSelectEdital }) => {
+export const EditalList: FC<EditalListProps> = ({
+  editais,
+  selectedId,
+  onSelectEdital,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore
+}) => {
   if (editais.length === 0) {
     return (
       <div className="bg-white rounded-lg shadow p-6 text-center text-gray-500">
@@ -70,10 +80,19 @@ export const EditalList: FC<EditalListProps> = ({ editais, selectedEdital, onSel
         <EditalListItem
           key={edital.id}
           edital={edital}
-          isSelected={selectedEdital?.id === edital.id}
+          isSelected={selectedId === edital.id}
           onClick={() => onSelectEdital(edital)}
         />
       ))}
+      {hasMore && (
+        <button
+          onClick={onLoadMore}
+          disabled={loadingMore}
+          className="w-full p-3 text-sm text-purple-700 hover:bg-purple-50 disabled:text-gray-400"
+        >
+          {loadingMore ? 'Carregando...' : 'Carregar mais'}
+        </button>
+      )}
     </div>
   );
 };
\ No newline at end of file
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Edital } from '../types';
+import { Edital, EditaisPage, EditalResumo } from '../types';
 
 const api = axios.create({
     baseURL: '/api'
@@ -10,6 +10,32 @@ export const getEditais = async (params: Record<string, string>) => {
     return response.data;
 };
 
+export const EDITAIS_PAGE_SIZE = 50;
+const LIST_FIELDS = 'nome,categoria,data_vencimento';
+
+export const getEditaisPage = async (
+    params: Record<string, string>,
+    cursor?: string | null
+): Promise<EditaisPage> => {
+    const response = await api.get<EditalResumo[]>('/editais', {
+        params: {
+            ...params,
+            limit: EDITAIS_PAGE_SIZE,
+            fields: LIST_FIELDS,
+            ...(cursor ? { cursor } : {})
+        }
+    });
+    return {
+        items: response.data,
+        nextCursor: response.headers['x-next-cursor'] ?? null
+    };
+};
+
+export const getEdital = async (id: number) => {
+    const response = await api.get<Edital>(`/editais/${id}`);
+    return response.data;
+};
+
 export const getCategorias = async () => {
     const response = await api.get<string[]>('/categorias');
     return response.data;
@@ -9,6 +9,14 @@ export interface Edital {
     fonte: string;
 }
 
+// Campos usados pela listagem lateral (GET /api/editais?fields=...)
+export type EditalResumo = Pick<Edital, 'id' | 'nome' | 'categoria' | 'data_vencimento'>;
+
+export interface EditaisPage {
+    items: EditalResumo[];
+    nextCursor: string | null;
+}
+
 export interface EditalFilters {
     search: string;
     categoria: string;